@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+"""Performance harness for parse, load, match and solve on synthetic dictionaries."""
@@ -0,0 +1,146 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Time startup, reading, deriving, loading, matching and solving on a synthetic dictionary.
+
+Usage: python -m benchmarks.run [--words N] [--repeat R] [--seed S] [--out PATH] [--baseline PATH] [--threshold F]
+
+Writes the best wall time per case of R repetitions as JSON and - given a baseline of an earlier run -
+exits with 1 if any case got slower than the baseline time times (1 + threshold).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import words_of_letters.words_of_letters as wol
+from benchmarks import synthetic
+
+LETTER_COUNTS = (wol.PICTURE_LETTERS, 24, wol.SWIPE_LETTERS)
+SLOT_COUNTS = tuple(range(1, wol.MAX_SLOTS + 1))
+MAX_SLOT_LENGTH = 7
+DEFAULT_OUT = "bench_output.json"
+DEFAULT_THRESHOLD = 0.25
+
+
+def best_of(repeat, func, *args):
+    """Return the fastest wall time in seconds of repeat calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def startup(argv):
+    """Run the command line in a fresh interpreter."""
+    subprocess.run([sys.executable, "-m", "words_of_letters", *argv], capture_output=True, check=False)
+
+
+def slot_lengths(n_letters, n_slots):
+    """Return n_slots word lengths fitting into n_letters or None if no slot can have two letters."""
+    if 2 * n_slots > n_letters:
+        return None
+    return [min(MAX_SLOT_LENGTH, n_letters // n_slots)] * n_slots
+
+
+def cases(language, repeat, seed):
+    """Yield (case name, seconds) of all benchmarks on the derived databases of the language."""
+    solver = wol.Solver(language=language)
+    for n_letters in LETTER_COUNTS:
+        material = synthetic.material(n_letters, seed)
+        for slots in (4, MAX_SLOT_LENGTH):
+            candidates = sorted(wol.read_mixed_case_word_text(slots, language))
+            yield f"match_gen:{n_letters}:{slots}", best_of(repeat, lambda c=candidates, m=material: list(wol.match_gen(c, m)))
+            wol.invalidate(language=language)
+            letter_set = set(material)  # Draining the lazy prefilter times the scan and not only opening the database
+            yield f"load:cold:{n_letters}:{slots}", best_of(1, lambda n=slots, ls=letter_set: list(wol.load(n, ls, language)))
+            yield f"load:warm:{n_letters}:{slots}", best_of(repeat, lambda n=slots, ls=letter_set: list(wol.load(n, ls, language)))
+        for n_slots in SLOT_COUNTS:
+            lengths = slot_lengths(n_letters, n_slots)
+            if lengths is None:
+                continue
+            argv = ["-l", language.name, *material, *(str(n) for n in lengths)]
+            yield f"parse:{n_letters}:{n_slots}", best_of(repeat, wol.prepare, argv)
+            yield f"solve:{n_letters}:{n_slots}", best_of(repeat, solver.query_argv, argv)
+    material = synthetic.material(wol.PICTURE_LETTERS, seed)
+    argv = ["-c", "-l", language.name, *material, "5", "4"]
+    yield f"solve:combine:{wol.PICTURE_LETTERS}:2", best_of(repeat, solver.query_argv, argv)
+
+
+def run(n_words=200_000, repeat=3, seed=42, work_dir=None):
+    """Generate the dictionary, time all cases and return the report."""
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        text_path = os.path.join(tmp, "synthetic.dict")
+        synthetic.write_dictionary(text_path, n_words, seed)
+        language = wol.register_language(
+            wol.Language("synthetic", wol.ALPHABET, text_path, os.path.join(tmp, "synthetic_dict_"))
+        )
+        try:
+            results = {
+                "startup:interpreter": best_of(repeat, subprocess.run, [sys.executable, "-c", "pass"]),
+                "startup:reject": best_of(repeat, startup, ["a", "b", "9"]),
+                "read_mixed_case_word_text": best_of(repeat, wol.read_mixed_case_word_text, 5, language),
+                "derive_databases": best_of(1, wol.derive_databases, synthetic.MIN_LENGTH, synthetic.MAX_LENGTH, True, language),
+            }
+            results.update(cases(language, repeat, seed))
+        finally:
+            wol.evict_language(language)
+            wol.LANGUAGES.pop(language.name, None)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "engine": wol.ENGINE,
+            "numpy": wol.store.numpy_module() is not None,
+            "words": n_words,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def regressions(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (case, seconds, baseline seconds) for cases slower than the baseline by more than the threshold."""
+    before = baseline.get("results", {})
+    return [
+        (case, seconds, before[case])
+        for case, seconds in report["results"].items()
+        if case in before and seconds > before[case] * (1 + threshold)
+    ]
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=200_000, help="number of synthetic words")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per case keeping the best")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the synthetic dictionary")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="path of the JSON report")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="tolerated slow down as fraction")
+    args = parser.parse_args(argv)
+
+    report = run(args.words, args.repeat, args.seed)
+    with open(args.out, "wt", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+    for case, seconds in report["results"].items():
+        print(f"{case:40s} {seconds * 1e3:10.3f} ms")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "rt", encoding="utf-8") as handle:
+        slower = regressions(report, json.load(handle), args.threshold)
+    for case, seconds, before in slower:
+        print(f"REGRESSION {case} took {seconds * 1e3:.3f} ms instead of {before * 1e3:.3f} ms", file=sys.stderr)
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Generate large reproducible German like dictionaries including umlauts and ß."""
+import random
+
+# Rough German letter frequencies in percent
+LETTER_WEIGHTS = {
+    "e": 16.4, "n": 9.8, "s": 7.3, "r": 7.0, "i": 6.5, "a": 6.5, "t": 6.2, "d": 5.1, "h": 4.6, "u": 4.2,
+    "l": 3.4, "c": 3.1, "g": 3.0, "m": 2.5, "o": 2.6, "b": 1.9, "w": 1.9, "f": 1.7, "k": 1.4, "z": 1.1,
+    "p": 0.8, "v": 0.8, "ü": 0.7, "ä": 0.6, "ß": 0.3, "ö": 0.3, "j": 0.3, "y": 0.04, "x": 0.03, "q": 0.02,
+}
+MIN_LENGTH = 2
+MAX_LENGTH = 24
+
+
+def words(count, seed=42):
+    """Return count distinct words - a quarter capitalized like German nouns - in random order."""
+    rng = random.Random(seed)
+    letters, weights = list(LETTER_WEIGHTS), list(LETTER_WEIGHTS.values())
+    lengths = range(MIN_LENGTH, MAX_LENGTH + 1)
+    length_weights = [1 / (1 + abs(n - 9)) for n in lengths]  # Peak around nine letters
+    found = set()
+    while len(found) < count:
+        n = rng.choices(lengths, length_weights)[0]
+        found.add("".join(rng.choices(letters, weights, k=n)))
+    result = sorted(found)
+    rng.shuffle(result)
+    return [word.capitalize() if rng.random() < 0.25 else word for word in result]
+
+
+def write_dictionary(path, count, seed=42):
+    """Write a synthetic dictionary text with one word per line."""
+    with open(path, "wt", encoding="utf-8") as handle:
+        for word in words(count, seed):
+            handle.write(f"{word}\n")
+
+
+def material(n_letters, seed=42):
+    """Return reproducible letter material of the size drawn with the dictionary letter weights."""
+    rng = random.Random(seed + n_letters)
+    return rng.choices(list(LETTER_WEIGHTS), list(LETTER_WEIGHTS.values()), k=n_letters)
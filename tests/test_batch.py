@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+import io
+import json
+
+import pytest  # type: ignore
+
+import words_of_letters.batch as batch
+import words_of_letters.cli as cli
+import words_of_letters.words_of_letters as wol
+
+LANGUAGE_GRAMMAR = "tgerman"  # Sample for German, new grammar
+LANGUAGE_TEXT_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}_title.dict"
+DB_BASE_PATH = f"tests/fixture/db/{LANGUAGE_GRAMMAR}_dict_"
+
+PUZZLES = (
+    "# daily pack\n"
+    "a t 2\n"
+    "\n"
+    "A B S A T 3 _ _ t 2\n"
+    "-c a b s a t 3 2\n"
+    "A B 12\n"
+)
+
+
+def setup_function():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+
+
+def test_read_puzzles_ok_skips_blank_and_comments():
+    puzzles = list(batch.read_puzzles(io.StringIO(PUZZLES)))
+    assert [number for number, _ in puzzles] == [2, 4, 5, 6]
+    assert puzzles[0][1] == ["a", "t", "2"]
+
+
+def test_solve_batch_ok_mixed():
+    results = batch.solve_batch(batch.read_puzzles(io.StringIO(PUZZLES)))
+    assert results[0]["matches"] == [{"slots": 2, "words": ["at"]}]
+    assert results[1]["matches"] == [{"slots": 3, "words": ["abt"]}, {"slots": 2, "words": ["at"]}]
+    assert results[2]["solutions"] == [("abs", "at")]
+    assert results[3]["errors"] == ["ERROR Only (2) characters given but requested (12) slots (12) ..."]
+
+
+def test_solve_batch_nok_unbalanced_quotes_fail_alone():
+    results = batch.solve_batch(batch.read_puzzles(io.StringIO("it's a t 2\na t 2\n")))
+    assert results[0]["line"] == 1 and results[0]["argv"] == ["it's a t 2"]
+    assert results[0]["errors"] == ["ERROR Cannot split puzzle line (it's a t 2) - No closing quotation"]
+    assert results[1]["matches"] == [{"slots": 2, "words": ["at"]}]
+
+
+def test_solve_batch_nok_missing_database():
+    results = batch.solve_batch([(1, ["a"] * 30 + ["30"])])
+    assert results[0]["errors"] == ["ERROR No database for word length (30)"]
+
+
+def test_main_ok_batch_file(tmp_path, capsys):
+    path = tmp_path / "puzzles.txt"
+    path.write_text("a t 2\nt a 2 _ a\n", encoding="utf-8")
+    assert cli.main(["--batch", str(path)]) == 0
+    out, err = capsys.readouterr()
+    lines = [json.loads(line) for line in out.splitlines()]
+    assert [line["matches"][0]["words"] for line in lines] == [["at"], []]
+
+
+def test_solve_batch_parallel_ok_same_order():
+    puzzles = list(batch.read_puzzles(io.StringIO(PUZZLES * 3)))
+    assert batch.solve_batch_parallel(puzzles, 2) == batch.solve_batch(puzzles)
+
+
+def test_solve_batch_nok_unreadable_database_fails_its_puzzles_only(tmp_path):
+    wol.DB_BASE_PATH = str(tmp_path / f"{LANGUAGE_GRAMMAR}_dict_")
+    try:
+        wol.derive_databases(2, 3)
+        with open(wol.db_path_of(3), "r+b") as handle:
+            handle.write(b"WOL\x01\xff\xff\x00\x00{garbage")
+        wol.invalidate()
+        results = batch.solve_batch(batch.read_puzzles(io.StringIO("a t 2\na b t 3\n")))
+        assert results[0]["matches"] == [{"slots": 2, "words": ["at"]}]
+        assert results[1]["errors"][0].startswith("ERROR Unreadable database for word length (3) - ")
+    finally:
+        wol.DB_BASE_PATH = DB_BASE_PATH
+        wol.invalidate()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+import json
+
+import pytest  # type: ignore
+
+import words_of_letters.words_of_letters as wol
+from benchmarks import run, synthetic
+
+
+def test_synthetic_words_reproducible_with_umlauts():
+    words = synthetic.words(2000, seed=7)
+    assert words == synthetic.words(2000, seed=7)
+    assert len(set(words)) == 2000
+    assert any(ch in word for word in words for ch in wol.EXTRA_LETTERS)
+    assert any(word[0].isupper() for word in words)
+
+
+def test_run_smoke(tmp_path):
+    report = run.run(n_words=2000, repeat=1, seed=7, work_dir=tmp_path)
+    results = report["results"]
+    assert report["meta"]["words"] == 2000
+    assert {"read_mixed_case_word_text", "derive_databases"} <= set(results)
+    assert f"solve:{wol.SWIPE_LETTERS}:{wol.MAX_SLOTS}" in results
+    assert all(seconds >= 0 for seconds in results.values())
+    assert "synthetic" not in wol.LANGUAGES
+
+
+def test_regressions():
+    baseline = {"results": {"a": 1.0, "b": 1.0}}
+    report = {"results": {"a": 1.2, "b": 1.3, "c": 9.0}}
+    assert run.regressions(report, baseline, 0.25) == [("b", 1.3, 1.0)]
+
+
+def test_main_fails_on_regression(tmp_path, monkeypatch):
+    monkeypatch.setattr(run, "run", lambda *_: {"meta": {}, "results": {"a": 2.0}})
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"a": 1.0}}))
+    out = tmp_path / "out.json"
+    assert run.main(["--out", str(out)]) == 0
+    assert json.loads(out.read_text())["results"] == {"a": 2.0}
+    assert run.main(["--out", str(out), "--baseline", str(baseline)]) == 1
+    assert run.main(["--out", str(out), "--baseline", str(baseline), "--threshold", "1.5"]) == 0
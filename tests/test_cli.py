@@ -1,5 +1,12 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=missing-docstring,unused-import,reimported
+import io
+import pathlib
+import re
+import subprocess
+import sys
+import time
+
 import pytest  # type: ignore
 
 import words_of_letters.cli as cli
@@ -8,6 +15,9 @@ import words_of_letters.words_of_letters as wol
 LANGUAGE_GRAMMAR = "tgerman"  # Sample for German, new grammar
 LANGUAGE_TEXT_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}_title.dict"
 DB_BASE_PATH = f"tests/fixture/db/{LANGUAGE_GRAMMAR}_dict_"
+wol.RESULT_CACHE_BYTES = 0  # Display tests exercise the solver and never results persisted by earlier runs
+ROOT = pathlib.Path(__file__).parent.parent
+STARTUP_BUDGET_SECONDS = 0.25  # Generous over a bare interpreter - rejecting takes a few milliseconds
 
 
 def test_main_nok_empty_array(capsys):
@@ -51,26 +61,47 @@ def test_main_nok_too_many_placeholders_same_size_slots(capsys):
     assert out.strip() == usage_feedback
 
 
+@pytest.mark.parametrize(
+    "job",
+    [
+        ["-w", "abc", "-c", "a", "t", "w", "a", "u", "2", "2"],
+        ["-l", "english", "-w", "abc", "a", "t", "2"],
+        ["--batch", "-w", "x", "puzzles.txt"],
+        ["--serve", "-w", "x"],
+    ],
+)
+def test_main_nok_workers_no_count(capsys, job):
+    assert cli.main(job) == 2
+    out, err = capsys.readouterr()
+    assert out.strip().splitlines()[-1].startswith("ERROR Workers (")
+
+
 def test_main_ok_init_short_option(capsys):
     wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
     job = ["-i", 2, 2]
     usage_feedback = (
         'Initializing word databases for sizes in [2, 2] ...'
     )
     assert cli.main(job) == 0
     out, err = capsys.readouterr()
-    assert out.strip() == usage_feedback
+    head, report = out.strip().split("\n")
+    assert head == usage_feedback
+    assert re.fullmatch(r"Stored \(\d+\) words in \(\d+\) bytes \([\d.]+ bytes per word\) - decoding \([\d.]+\) MB/s", report)
 
 
 def test_main_ok_init_long_option(capsys):
     wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
     job = ["--init", 2, 3]
     usage_feedback = (
         'Initializing word databases for sizes in [2, 3] ...'
     )
     assert cli.main(job) == 0
     out, err = capsys.readouterr()
-    assert out.strip() == usage_feedback
+    head, report = out.strip().split("\n")
+    assert head == usage_feedback
+    assert re.fullmatch(r"Stored \(\d+\) words in \(\d+\) bytes \([\d.]+ bytes per word\) - decoding \([\d.]+\) MB/s", report)
 
 
 def test_main_ok_minimal_with_placeholders(capsys):
@@ -109,3 +140,92 @@ def test_main_ok_minimal_with_placeholders_stanzas(capsys):
     assert cli.main(job) == 0
     out, err = capsys.readouterr()
     assert out.strip() == screen_display
+
+
+def test_main_ok_migrate_nothing_to_migrate(capsys):
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    job = ["--migrate", 30, 31]
+    usage_feedback = (
+        'Migrating pickled word databases for sizes in [30, 31] ...\n'
+        'Migrated sizes ()'
+    )
+    assert cli.main(job) == 0
+    out, err = capsys.readouterr()
+    assert out.strip() == usage_feedback
+
+
+HEAVY_MODULES = ("words_of_letters.words_of_letters", "words_of_letters.store", "numpy", "pickle", "mmap")
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+
+
+def test_main_nok_rejects_before_importing_solver():
+    code = (
+        "import sys; from words_of_letters import cli; "
+        "rc = cli.main(['a', 'b', 'x1', '9']); "
+        f"print(rc, [m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    out = run_python(code).stdout.strip().splitlines()
+    assert out == [
+        "WARNING Ignoring characters/slot (x1) ...",
+        "ERROR Only (2) characters given but requested (9) slots (9) ...",
+        "2 []",
+    ]
+
+
+def test_main_ok_solves_small_buckets_without_numpy():
+    code = (
+        "import sys; from words_of_letters import cli; import words_of_letters.words_of_letters as wol; "
+        f"wol.LANGUAGE_TEXT_FILE_PATH = {LANGUAGE_TEXT_FILE_PATH!r}; wol.DB_BASE_PATH = {DB_BASE_PATH!r}; "
+        "wol.RESULT_CACHE_BYTES = 0; wol.derive_databases(2, 2); "
+        "rc = cli.main(['a', 't', '2']); "
+        "print(rc, 'numpy' in sys.modules)"
+    )
+    out = run_python(code).stdout.strip().splitlines()
+    assert "    0) at" in out and out[-1] == "0 False"
+
+
+def test_main_ok_fast_startup_on_reject():
+    def best(argv):
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *argv], capture_output=True, check=False, cwd=ROOT)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    overhead = best(["-m", "words_of_letters", "a", "9"]) - best(["-c", "pass"])
+    assert overhead < STARTUP_BUDGET_SECONDS
+
+
+def test_main_ok_pattern_skips_puzzle_validation(capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    assert cli.main(["-p", "a?", "2", "3"]) == 0
+    out, err = capsys.readouterr()
+    assert out.strip().splitlines()[-2:] == ['    0) at', '    1) au']
+
+
+def test_main_ok_check_words(capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    assert cli.main(["--check", "AT", "abs"]) == 0
+    out, err = capsys.readouterr()
+    assert out.splitlines() == ["AT\tvalid", "abs\tvalid"]
+    assert cli.main(["--check", "at", "ta", "abcdefghijklmnopq"]) == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines() == ["at\tvalid", "ta\tinvalid", "abcdefghijklmnopq\tinvalid"]
+
+
+def test_main_ok_check_words_from_stdin(capsys, monkeypatch):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("Abt\n\nbh\nxy\n"))
+    assert cli.main(["--check", "-"]) == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines() == ["Abt\tvalid", "bh\tvalid", "xy\tinvalid"]
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+import io
+import json
+
+import pytest  # type: ignore
+
+import words_of_letters.instrument as instrument
+import words_of_letters.words_of_letters as wol
+
+LANGUAGE_GRAMMAR = "tgerman"  # Sample for German, new grammar
+LANGUAGE_TEXT_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}_title.dict"
+DB_BASE_PATH = f"tests/fixture/db/{LANGUAGE_GRAMMAR}_dict_"
+
+
+@pytest.fixture
+def debug():
+    def enable(value="1"):
+        instrument.configure(value)
+
+    yield enable
+    instrument.configure(None)
+
+
+def test_mode_of():
+    assert instrument.mode_of(None) is None
+    assert instrument.mode_of("0") is None
+    assert instrument.mode_of("1") == "json"
+    assert instrument.mode_of("Profile") == "profile"
+    assert instrument.mode_of("memory") == "memory"
+
+
+def test_disabled_is_no_op():
+    assert not instrument.ENABLED
+    assert instrument.phase("x") is instrument.NULL
+    stream = iter("ab")
+    assert instrument.counted("x", stream) is stream
+    instrument.count("x")
+    out = io.StringIO()
+    instrument.emit(out)
+    assert out.getvalue() == ""
+    assert instrument.report() == {"phases": {}, "counters": {}}
+
+
+def test_enabled_records(debug):
+    debug()
+    with instrument.phase("work"):
+        sum(range(1000))
+    with instrument.phase("work"):
+        pass
+    assert list(instrument.counted("seen", "abc")) == ["a", "b", "c"]
+    instrument.count("seen", 2)
+    out = io.StringIO()
+    instrument.emit(out, cache={"hits": 1})
+    record = json.loads(out.getvalue())
+    assert record["phases"]["work"]["calls"] == 2
+    assert record["phases"]["work"]["wall"] >= 0
+    assert record["counters"] == {"seen": 5}
+    assert record["cache"] == {"hits": 1}
+    assert instrument.report() == {"phases": {}, "counters": {}}
+
+
+def test_solve_emits_phases(debug, capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    debug()
+    assert wol.solve(["a", "b", "s", "a", "t", "2", "3"]) == 0
+    out, err = capsys.readouterr()
+    record = json.loads(err)
+    assert {"parse", "open", "match:2", "match:3", "render"} <= set(record["phases"])
+    assert record["counters"]["match:2:matched"] == 1
+    assert record["counters"]["match:3:words"] >= record["counters"]["match:3:matched"]
+    assert "hits" in record["cache"]
+
+
+@pytest.mark.parametrize("mode, key", [("profile", "profile"), ("memory", "memory")])
+def test_capture_modes(debug, mode, key):
+    debug(mode)
+    with instrument.capture():
+        sorted(str(n) for n in range(1000))
+    assert key in instrument.report()
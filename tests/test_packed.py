@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+import gc
+import warnings
+
+import pytest  # type: ignore
+
+import words_of_letters.packed as packed
+import words_of_letters.words_of_letters as wol
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyzäöüß"
+WORDS = {2: {"at", "ab", "zu"}, 3: {f"{a}{b}{c}" for a in "abcz" for b in "aeiu" for c in "nrsß"}}
+
+
+def test_front_code_ok_roundtrip():
+    words = sorted(["straße", "straßen", "strauß", "strauße", "strom", "süß", "ütz"])
+    blob = packed.front_code(words)
+    assert packed.front_decode(blob) == words
+    assert len(blob) < sum(len(word.encode("utf-8")) + 1 for word in words)
+
+
+@pytest.mark.parametrize("codec", sorted(packed.CODECS))
+def test_packed_database_ok_roundtrip(tmp_path, codec):
+    path = str(tmp_path / "db_packed.woz")
+    packed.write_packed(path, WORDS, ALPHABET, codec, block_words=5)
+    with packed.PackedDatabase(path) as database:
+        assert database.lengths == [2, 3]
+        assert database.count(3) == len(WORDS[3])
+        assert list(database.words(3)) == sorted(WORDS[3])
+        assert "zuß" in database and "ait" not in database and "abcd" not in database
+        assert sorted(database.prefiltered(3, set("bas"))) == ["aas", "bas"]
+        assert sorted(database.prefiltered(3, set("bas"), blanks=1)) == sorted(
+            word for word in WORDS[3] if len(set(word) - set("bas")) <= 1
+        )
+
+
+def test_packed_database_ok_decompresses_only_needed_blocks(tmp_path):
+    path = str(tmp_path / "db_packed.woz")
+    packed.write_packed(path, WORDS, ALPHABET, block_words=4)
+    with packed.PackedDatabase(path) as database:
+        assert "cun" in database
+        assert len(database._blocks) == 1  # pylint: disable=protected-access
+        assert list(database.words(3, "ci")) == ["cin", "cir", "cis", "ciß"]
+        assert len(database._blocks) <= 3  # pylint: disable=protected-access
+
+
+def test_packed_database_nok_no_packed_file(tmp_path):
+    path = tmp_path / "db_2.wol"
+    path.write_bytes(b"WOL\x01")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with pytest.raises(ValueError):
+            packed.PackedDatabase(str(path))
+        with pytest.raises(FileNotFoundError):
+            packed.PackedDatabase(str(tmp_path / "missing.woz"))
+        gc.collect()
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_packed_database_nok_failed_open_leaves_other_files_alone(tmp_path):
+    path = tmp_path / "db_2.wol"
+    path.write_bytes(b"WOL\x01")
+    with pytest.raises(ValueError):
+        packed.PackedDatabase(str(path))
+    with open(path, "rb") as handle:
+        gc.collect()
+        assert handle.read() == b"WOL\x01"
+
+
+def test_solve_ok_init_packed_serves_queries(tmp_path, capsys):
+    text = tmp_path / "words.dict"
+    text.write_text("Ab\nat\nzu\nbas\nBus\nsub\n", encoding="utf-8")
+    language = wol.Language("packed", ALPHABET, str(text), str(tmp_path / "db_"))
+    wol.register_language(language)
+    try:
+        assert wol.solve(["-l", "packed", "-i", "2", "3", "--packed=lzma"]) == 0
+        out, _ = capsys.readouterr()
+        assert "Stored (6) words in (" in out
+        assert sorted(wol.candidates_matching(3, "abus", language=language)) == ["bas", "bus", "sub"]
+        assert sorted(wol.candidates_matching(3, "abus", {0: "s"}, language=language)) == ["sub"]
+        assert [ok for _, ok in wol.check_words(["Bus", "bis"], language)] == [True, False]
+        assert wol.solve(["-l", "packed", "-i", "2", "3", "--packed=gz"]) == 2
+    finally:
+        wol.PACKED.clear()
+        wol.LANGUAGES.pop("packed")
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+import pytest  # type: ignore
+
+import words_of_letters.pattern as pattern
+import words_of_letters.words_of_letters as wol
+
+LANGUAGE_GRAMMAR = "tgerman"  # Sample for German, new grammar
+LANGUAGE_TEXT_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}_title.dict"
+
+
+def test_compile_pattern_ok_suffix():
+    compiled = pattern.compile_pattern("*UNG")
+    assert (compiled.min_length, compiled.fixed, compiled.prefix) == (3, False, ())
+    assert compiled.places(7) == {4: "u", 5: "n", 6: "g"}
+    assert compiled.grams == ("ung",)
+    assert compiled.lengths(2, 5) == [3, 4, 5]
+    assert compiled.matches("zeitung") and not compiled.matches("ungut")
+
+
+def test_compile_pattern_ok_wildcards_and_classes():
+    compiled = pattern.compile_pattern("ab?d[!x]*sch*ung")
+    assert compiled.min_length == 11
+    assert compiled.places(12) == {0: "a", 1: "b", 3: "d", 9: "u", 10: "n", 11: "g"}
+    assert compiled.grams == ("sch", "ung")
+    assert compiled.matches("abcdeschung") and not compiled.matches("abcdxschung")
+
+
+def test_compile_pattern_ok_fixed_length():
+    compiled = pattern.compile_pattern("a?t")
+    assert compiled.fixed
+    assert compiled.lengths(2, 9) == [3]
+    assert compiled.lengths(4, 9) == []
+
+
+def test_compile_pattern_ok_regex():
+    compiled = pattern.compile_pattern("/^ab.*t$/")
+    assert (compiled.prefix, compiled.grams) == ((), ())
+    assert compiled.matches("abbaut") and not compiled.matches("abbaue")
+
+
+@pytest.mark.parametrize(
+    "text, word, expected",
+    [
+        ("[ab]*", "xcacd", False),
+        ("[ab]*", "bcacd", True),
+        ("[!a]b*", "abxb", False),
+        ("[!a]b*", "xbab", True),
+        ("[ab]c*", "xcacd", False),
+        ("?c*", "xcacd", True),
+        ("*c?", "acadd", False),
+    ],
+)
+def test_compile_pattern_ok_glob_matches_whole_word(text, word, expected):
+    assert pattern.compile_pattern(text).matches(word) is expected
+
+
+def test_compile_pattern_ok_regex_escapes_kept():
+    compiled = pattern.compile_pattern(r"/^A\D+$/")
+    assert compiled.matches("abt") and not compiled.matches("a12")
+    assert pattern.compile_pattern(r"/^\w+\S$/").matches("abt")
+    assert not pattern.compile_pattern(r"/\W/").matches("abt")
+
+
+@pytest.mark.parametrize("text", ["", "/a(/"])
+def test_compile_pattern_nok(text):
+    with pytest.raises(ValueError):
+        pattern.compile_pattern(text)
+
+
+def test_candidates_by_pattern_ok_across_lengths(tmp_path):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = str(tmp_path / f"{LANGUAGE_GRAMMAR}_dict_")
+    wol.derive_databases(2, 8)
+    found = wol.candidates_by_pattern(pattern.compile_pattern("*bau*"), 4, 9)
+    assert found == {4: [], 5: ["abbau"], 6: ["abbaue", "abbaus", "abbaut"], 7: ["abbauen", "abbaust"], 8: []}
+    found = wol.candidates_by_pattern(pattern.compile_pattern("*t"), 3, 6, list("abbaust"))
+    assert found == {3: ["abt"], 4: [], 5: [], 6: ["abbaut"]}
+    assert wol.candidates_by_pattern(pattern.compile_pattern("/ig/"), 2, 8) == wol.candidates_by_pattern(
+        pattern.compile_pattern("*ig*"), 2, 8
+    )
+    found = wol.candidates_by_pattern(pattern.compile_pattern("[ab]*"), 2, 8)
+    assert found and all(word[0] in "ab" for words in found.values() for word in words)
+    found = wol.candidates_by_pattern(pattern.compile_pattern("[!a]b*"), 2, 8)
+    assert all(word[0] != "a" and word[1] == "b" for words in found.values() for word in words)
+
+
+def test_solve_ok_pattern(tmp_path, capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = str(tmp_path / f"{LANGUAGE_GRAMMAR}_dict_")
+    wol.derive_databases(2, 8)
+    screen_display = (
+        'Found 1 candidates of length(5) matching pattern(üb*en):\n'
+        '\n'
+        '    0) üblen\n'
+        '\n'
+        '\n'
+        'Found 1 candidates of length(7) matching pattern(üb*en):\n'
+        '\n'
+        '    0) übrigen'
+    )
+    assert wol.solve(["--pattern", "üb*en", "2", "9"]) == 0
+    out, err = capsys.readouterr()
+    assert out.strip() == screen_display
+    assert wol.solve(["-p", "*xyz", "2", "9"]) == 0
+    out, err = capsys.readouterr()
+    assert out.strip() == "Found 0 candidates matching pattern(*xyz)"
+
+
+def test_solve_nok_pattern_without_lengths(capsys):
+    assert wol.solve(["-p", "*ung", "a"]) == 2
+    out, err = capsys.readouterr()
+    assert out.strip() == "ERROR Pattern needs word lengths <first> [<last>] - received (a)"
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest  # type: ignore
+
+import words_of_letters.results as results
+import words_of_letters.words_of_letters as wol
+
+LANGUAGE_GRAMMAR = "tgerman"  # Sample for German, new grammar
+LANGUAGE_TEXT_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}_title.dict"
+
+
+def fill(path, prefix):
+    cache = results.ResultCache(path, 1 << 20)
+    for n in range(50):
+        cache.put(f"{prefix}{n}", {"n": n})
+    cache.close()
+    return prefix
+
+
+def test_result_cache_ok_roundtrip(tmp_path):
+    cache = results.ResultCache(str(tmp_path / "results.sqlite"), 1 << 20)
+    assert cache.get("k") is None
+    cache.put("k", {"matches": [[2, ["at"]]]})
+    assert cache.get("k") == {"matches": [[2, ["at"]]]}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1 and cache.stats()["entries"] == 1
+    cache.clear()
+    assert cache.get("k") is None
+
+
+def test_result_cache_ok_evicts_least_recently_used(tmp_path):
+    value = {"words": ["x" * 80]}
+    size = len(results.json.dumps(value))
+    cache = results.ResultCache(str(tmp_path / "results.sqlite"), 2 * size)
+    cache.put("a", value)
+    cache.put("b", value)
+    assert cache.get("a") == value
+    cache.put("c", value)
+    assert cache.get("b") is None
+    assert cache.get("a") == value and cache.get("c") == value
+    assert cache.stats()["size"] <= 2 * size
+
+
+def test_result_cache_ok_misses_if_unusable(tmp_path):
+    cache = results.ResultCache(str(tmp_path / "missing" / "results.sqlite"), 1 << 20)
+    cache.put("k", {"n": 1})
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_result_cache_ok_concurrent_processes(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert list(pool.map(fill, [path] * 4, "abcd")) == list("abcd")
+    assert results.ResultCache(path, 1 << 20).stats()["entries"] == 200
+
+
+def test_solver_ok_serves_repeated_canonical_query(tmp_path):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = str(tmp_path / f"{LANGUAGE_GRAMMAR}_dict_")
+    wol.derive_databases(2, 3)
+    cache = results.ResultCache(wol.result_cache_path(), 1 << 20)
+    solver = wol.Solver(results=cache)
+    first = solver.query_argv(["a", "b", "s", "a", "t", "3", "2"])
+    again = solver.query_argv(["T", "a", "s", "b", "a", "2", "3"])
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert again.matches == first.matches
+    assert again.letters == ["t", "a", "s", "b", "a"]
+    combined = solver.query_argv(["-c", "a", "b", "s", "a", "t", "3", "2"])
+    assert solver.query_argv(["-c", "a", "b", "s", "a", "t", "3", "2"]).solutions == combined.solutions == [("abs", "at")]
+    assert cache.hits == 2
+
+
+def test_solver_ok_misses_after_databases_change(tmp_path):
+    text_path = tmp_path / "words.dict"
+    text_path.write_text("at\nab\n", encoding="utf-8")
+    wol.LANGUAGE_TEXT_FILE_PATH = str(text_path)
+    wol.DB_BASE_PATH = str(tmp_path / f"{LANGUAGE_GRAMMAR}_dict_")
+    wol.derive_databases(2, 2)
+    solver = wol.Solver(results=results.ResultCache(wol.result_cache_path(), 1 << 20))
+    assert solver.query_argv(["a", "b", "t", "2"]).matches[0].words == ["ab", "at"]
+    text_path.write_text("at\nab\nba\n", encoding="utf-8")
+    wol.derive_databases(2, 2)
+    assert solver.query_argv(["a", "b", "t", "2"]).matches[0].words == ["ab", "at", "ba"]
+    assert solver.results.hits == 0
+
+
+def test_solver_ok_misses_after_software_change(tmp_path, monkeypatch):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = str(tmp_path / f"{LANGUAGE_GRAMMAR}_dict_")
+    wol.derive_databases(2, 3)
+    solver = wol.Solver(results=results.ResultCache(wol.result_cache_path(), 1 << 20))
+    solver.query_argv(["a", "b", "t", "2"])
+    monkeypatch.setattr(wol, "SOLVER_VERSION", wol.SOLVER_VERSION + 1)
+    solver.query_argv(["a", "b", "t", "2"])
+    monkeypatch.setattr(wol, "ENGINE", "python")
+    solver.query_argv(["a", "b", "t", "2"])
+    assert solver.results.hits == 0
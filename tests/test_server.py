@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+
+import words_of_letters.server as server
+import words_of_letters.words_of_letters as wol
+
+LANGUAGE_GRAMMAR = "tgerman"  # Sample for German, new grammar
+LANGUAGE_TEXT_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}_title.dict"
+DB_BASE_PATH = f"tests/fixture/db/{LANGUAGE_GRAMMAR}_dict_"
+
+
+def setup_function():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+
+
+def test_parse_request_nok():
+    with pytest.raises(ValueError, match="no JSON"):
+        server.parse_request("a t 2")
+    with pytest.raises(ValueError, match="argv"):
+        server.parse_request('{"argv": "a t 2"}')
+    assert server.parse_request('{"argv": ["a", "t", "2"]}') == ["a", "t", "2"]
+
+
+def test_serve_ok_concurrent_clients(tmp_path):
+    address = str(tmp_path / "wol.sock")
+
+    async def ask(lines):
+        reader, writer = await asyncio.open_unix_connection(address)
+        answers = []
+        for line in lines:
+            writer.write(line.encode("utf-8") + b"\n")
+            await writer.drain()
+            answers.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+        return answers
+
+    async def scenario():
+        with ThreadPoolExecutor(2) as pool:
+            srv = await server.start(address, pool)
+            async with srv:
+                return await asyncio.gather(
+                    ask(['{"argv": ["a", "t", "2"]}', "nonsense"]),
+                    ask(['{"argv": ["-c", "a", "b", "s", "a", "t", "3", "2"]}']),
+                )
+
+    first, second = asyncio.run(scenario())
+    assert "line" not in first[0] and first[0]["argv"] == ["a", "t", "2"]
+    assert first[0]["matches"] == [{"slots": 2, "words": ["at"]}]
+    assert first[1]["errors"][0].startswith("ERROR Request is no JSON")
+    assert second[0]["solutions"] == [["abs", "at"]]
+
+
+def test_serve_nok_worker_failure_answered(tmp_path, monkeypatch):
+    address = str(tmp_path / "wol.sock")
+
+    def broken(argv):
+        raise RuntimeError(f"broken database for {argv}")
+
+    async def scenario():
+        with ThreadPoolExecutor(1) as pool:
+            srv = await server.start(address, pool)
+            async with srv:
+                reader, writer = await asyncio.open_unix_connection(address)
+                answers = []
+                for argv in (["a", "t", "2"], ["a", "b", "2"]):
+                    writer.write(json.dumps({"argv": argv}).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    answers.append(json.loads(await reader.readline()))
+                writer.close()
+                await writer.wait_closed()
+                return answers
+
+    monkeypatch.setattr(server, "solve_one", broken)
+    answers = asyncio.run(scenario())
+    assert [answer["errors"] for answer in answers] == [
+        ["ERROR Solving failed (RuntimeError: broken database for ['a', 't', '2'])"],
+        ["ERROR Solving failed (RuntimeError: broken database for ['a', 'b', '2'])"],
+    ]
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring,unused-import,reimported
+import array
+
+import pytest  # type: ignore
+
+import words_of_letters.store as store
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyzäöüß"
+WORDS = {'abo', 'abs', 'abt', 'äse', 'äst', 'öde', 'bas', 'sab'}
+
+
+def test_write_database_ok_roundtrip(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    with store.Database(path) as database:
+        assert len(database) == len(WORDS)
+        assert sorted(database) == sorted(WORDS)
+        assert database.header["word_length"] == 3
+
+
+def test_database_ok_anagram_groups_contiguous(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    with store.Database(path) as database:
+        groups = [[database.word(n) for n in range(*bounds)] for bounds in database.groups(set("abs"))]
+    assert groups == [['abs', 'bas', 'sab']]
+
+
+def test_database_ok_matching(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    with store.Database(path) as database:
+        assert sorted(database.matching(list("abst"))) == ['abs', 'abt', 'bas', 'sab']
+        assert sorted(database.matching(list("abst"), {0: "s"})) == ['sab']
+        assert sorted(database.matching(list("äset"))) == ['äse', 'äst']
+        assert sorted(database.prefiltered(set("ab"))) == []
+
+
+def test_database_ok_matching_many_in_one_pass(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    queries = [(list("abst"), None), (list("abst"), {0: "s"}), (list("äset"), {})]
+    with store.Database(path) as database:
+        found = database.matching_many(queries)
+        assert found == [list(database.matching(material, places)) for material, places in queries]
+    assert [sorted(words) for words in found] == [['abs', 'abt', 'bas', 'sab'], ['sab'], ['äse', 'äst']]
+
+
+def test_database_ok_positional_postings(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    with store.Database(path) as database:
+        assert sorted(database.word(n) for n in database.posting(0, "a")) == ['abo', 'abs', 'abt']
+        assert list(database.posting(2, "W")) == []
+        assert list(database.matching_places(list("abst"), {0: "a", 2: "s"})) == ['abs']
+        assert list(database.matching_places(list("abst"), {1: "b"})) == ['abs', 'abt']
+        assert list(database.matching_places(list("abso"), {0: "ö"})) == []
+
+
+def test_database_ok_matching_vectorized_same_as_matching(tmp_path, monkeypatch):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    queries = [(list("abst"), None), (list("abst"), {0: "s"}), (list("äset"), {}), (list("abst"), {1: "W"})]
+    with store.Database(path) as database:
+        expected = [list(database.matching(material, places)) for material, places in queries]
+        assert [list(database.matching_vectorized(material, places)) for material, places in queries] == expected
+        monkeypatch.setattr(store, "numpy", None)
+        assert [list(database.matching_vectorized(material, places)) for material, places in queries] == expected
+
+
+def test_database_ok_matching_vectorized_numpy(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS | {'ab4'}, ALPHABET)
+    with store.Database(path) as database:
+        assert list(database.matching_vectorized(list("abst4"))) == list(database.matching(list("abst4")))
+        assert list(database.matching_vectorized(list("abst"))) == ['abs', 'bas', 'sab', 'abt']
+        assert list(database.matching_vectorized(list("abst"), {2: "s"})) == ['abs', 'bas']
+
+
+def test_dawg_of_ok_shares_suffixes():
+    letter_index = {ch: n for n, ch in enumerate(ALPHABET)}
+    bounds, labels, targets = store.dawg_of(sorted({"bat", "cat", "bot", "cot"}), letter_index)
+    assert len(bounds) - 1 == 4  # final, t, a|o, root b|c
+    assert labels.typecode == "B"
+    assert [ALPHABET[label] for label in labels[bounds[-2] : bounds[-1]]] == ["b", "c"]
+    assert len(set(targets[bounds[-2] : bounds[-1]])) == 1
+
+
+def test_database_ok_matching_dawg_same_as_matching(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS | {"abß", "s-a"}, ALPHABET, dawg=True)
+    queries = [list("abst"), list("äset"), list("abstoßäöe"), list("s-a"), list("xyz"), []]
+    with store.Database(path) as database:
+        for material in queries:
+            for places in (None, {0: "a"}, {0: "s", 2: "b"}, {1: "ß"}):
+                expected = sorted(database.matching(material, places))
+                assert list(database.matching_dawg(material, places)) == expected
+
+
+def test_database_ok_matching_dawg_falls_back_without_graph(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    with store.Database(path) as database:
+        assert not database.has_section("dawg_letters")
+        assert sorted(database.matching_dawg(list("abst"))) == ['abs', 'abt', 'bas', 'sab']
+
+
+def test_fits_ok_blanks_cover_deficits():
+    l_c, blanks = store.material_counts(list("ab__"))
+    assert (l_c, blanks) == ({"a": 1, "b": 1}, 2)
+    assert store.fits("abt", l_c, blanks)
+    assert store.fits("ott", l_c, blanks) is False
+    assert store.fits("abt", l_c) is False
+    assert store.blanks_of(["abt", "at"], list("abs__")) == "att"
+
+
+def test_covers_ok_never_other_characters():
+    bits = store.letter_bits_of(ALPHABET)
+    m_mask = store.letter_mask("ab", bits)
+    assert store.covers(store.letter_mask("ab", bits), m_mask)
+    assert store.covers(store.letter_mask("abt", bits), m_mask, 1)
+    assert not store.covers(store.letter_mask("ast", bits), m_mask, 1)
+    assert not store.covers(store.letter_mask("a-", bits), m_mask, 1)
+
+
+@pytest.mark.parametrize("material", ["ab_", "a__", "___", "äs_", "ß_"])
+def test_database_ok_blanks_same_for_all_engines(tmp_path, material):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS | {"a-b"}, ALPHABET, {"abs": 3, "sab": 2}, dawg=True)
+    material = list(material)
+    l_c, blanks = store.material_counts(material)
+    with store.Database(path) as database:
+        for places in (None, {0: "a"}, {2: "s"}):
+            expected = sorted(
+                w for w in database if store.fits(w, l_c, blanks) and "-" not in w and all(w[c] == m for c, m in (places or {}).items())
+            )
+            assert sorted(database.matching(material, places)) == expected
+            assert sorted(database.matching_vectorized(material, places)) == expected
+            assert list(database.matching_dawg(material, places)) == expected
+            assert sorted(database.by_frequency(material, places)) == expected
+            assert sorted(database.matching_many([(material, places)])[0]) == expected
+
+
+def test_database_ok_trigrams_and_pattern_ids(tmp_path):
+    path = tmp_path / "db_5.wol"
+    store.write_database(path, {"abbau", "abbog", "übers", "ölte-"}, ALPHABET)
+    with store.Database(path) as database:
+        assert sorted(database.word(n) for n in database.trigram("abb")) == ["abbau", "abbog"]
+        assert list(database.trigram("xyz")) == []
+        assert list(database.trigram("te-")) == []
+        assert [database.word(n) for n in database.pattern_ids({4: "u"}, ("bba",))] == ["abbau"]
+        assert database.pattern_ids({4: "-"}, ("te-",)) is None
+
+
+def test_database_ok_membership(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    with store.Database(path) as database:
+        assert all(word in database for word in WORDS)
+        assert not any(word in database for word in ("abz", "ABS", "sba", "ab", "abst"))
+        assert database.header["sections"]["bloom"][1] >= len(WORDS) * store.BLOOM_BITS_PER_WORD // 8
+        database._hashes = None
+        assert "abs" in database and "abz" not in database
+
+
+def test_bloom_of_ok_no_false_negatives():
+    hashes = [store.word_hash(f"w{n}") for n in range(1000)]
+    bloom = store.bloom_of(hashes, len(hashes))
+    n_bits = len(bloom) * 8
+    assert all(all(bloom[p >> 3] >> (p & 7) & 1 for p in store.bloom_positions(h, n_bits)) for h in hashes)
+
+
+def test_database_ok_find_and_frequencies(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET, {'abt': 50, 'sab': 7, 'abs': 10, 'xyz': 99})
+    with store.Database(path) as database:
+        assert database.ranks_frequency
+        assert all(database.word(database.find(word)) == word for word in WORDS)
+        assert database.find('tba') is None
+        assert [database.frequency(word) for word in ('abt', 'bas', 'xyz')] == [50, 0, 0]
+        assert list(database.by_frequency(list("abst"))) == ['abt', 'abs', 'sab', 'bas']
+        assert list(database.by_frequency(list("abst"), {0: "s"})) == ['sab']
+
+
+def test_database_nok_not_a_database(tmp_path):
+    path = tmp_path / "db_3.wol"
+    path.write_bytes(b"NOPE" + b"\0" * 8)
+    with pytest.raises(ValueError):
+        store.Database(path)
+
+
+def test_atomic_write_ok_no_leftovers(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    store.write_database(path, {'abo'}, ALPHABET)
+    assert [p.name for p in tmp_path.iterdir()] == ["db_3.wol"]
+    with store.Database(path) as database:
+        assert list(database) == ['abo']
+
+
+def test_database_cache_ok_lru_eviction(tmp_path):
+    paths = [tmp_path / f"db_{n}.wol" for n in range(3)]
+    for path in paths:
+        store.write_database(path, WORDS, ALPHABET)
+    cache = store.DatabaseCache(budget=1)
+    first = cache.get(paths[0])
+    assert cache.get(paths[0]) is first
+    cache.get(paths[1])
+    assert cache.stats()["entries"] == 1
+    assert cache.get(paths[0]) is not first
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 2)
+
+
+def test_database_cache_ok_reopens_replaced_file(tmp_path):
+    path = tmp_path / "db_3.wol"
+    store.write_database(path, WORDS, ALPHABET)
+    cache = store.DatabaseCache(budget=1 << 20)
+    assert len(cache.get(path)) == len(WORDS)
+    store.write_database(path, {'abo'}, ALPHABET)
+    assert list(cache.get(path)) == ['abo']
+    cache.invalidate()
+    assert cache.stats()["size"] == 0
+
+
+def test_intersect_ok_sorted_postings():
+    shortest = memoryview(array.array("I", [3, 7, 9, 40]))
+    longer = memoryview(array.array("I", range(0, 41)))
+    sparse = memoryview(array.array("I", [1, 3, 8, 9, 41]))
+    assert store.intersect([longer, sparse, shortest]) == [3, 9]
+    assert store.intersect([shortest, memoryview(array.array("I", [50]))]) == []
+    assert store.intersect([shortest]) == [3, 7, 9, 40]
@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=missing-docstring,unused-import,reimported
+import pickle
+
 import pytest  # type: ignore
 
 import words_of_letters.words_of_letters as wol
 
 LANGUAGE_GRAMMAR = "tgerman"  # Sample for German, new grammar
 LANGUAGE_TEXT_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}_title.dict"
+LANGUAGE_FREQUENCY_FILE_PATH = f"tests/fixture/text/{LANGUAGE_GRAMMAR}.freq"
 DB_BASE_PATH = f"tests/fixture/db/{LANGUAGE_GRAMMAR}_dict_"
+wol.RESULT_CACHE_BYTES = 0  # Display tests exercise the solver and never results persisted by earlier runs
 
 
 def test_read_mixed_case_word_text_ok_minimal():
@@ -15,6 +19,19 @@ def test_read_mixed_case_word_text_ok_minimal():
     assert wol.read_mixed_case_word_text(word_length) == {'at', 'wc', 'bh', 'wm', 'wg', 'au'}
 
 
+def test_read_word_text_buckets_ok_single_pass():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    buckets = wol.read_word_text_buckets(range(2, 4))
+    assert sorted(buckets) == [2, 3]
+    assert buckets[2] == wol.read_mixed_case_word_text(2)
+    assert buckets[3] == {'abo', 'abs', 'abt', 'äse', 'äst', 'öde'}
+
+
+def test_read_word_text_buckets_ok_empty_bucket():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    assert wol.read_word_text_buckets((42,)) == {42: set()}
+
+
 def test_dump_ok_minimal():
     wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
     wol.DB_BASE_PATH = DB_BASE_PATH
@@ -25,7 +42,161 @@ def test_load_ok_minimal():
     wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
     wol.DB_BASE_PATH = DB_BASE_PATH
     word_length = 2
-    assert set(wol.load(word_length, {"a"})) == {'at', 'au'}
+    assert set(wol.load(word_length, {"a", "t", "u"})) == {'at', 'au'}
+
+
+def test_load_ok_each_candidate_once():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    word_length = 2
+    candidates = list(wol.load(word_length, set("atuwcgmbh")))
+    assert sorted(candidates) == ['at', 'au', 'bh', 'wc', 'wg', 'wm']
+
+
+def test_prefilter_ok_rejects_missing_letters():
+    assert list(wol.prefilter(['at', 'au', 'ta'], {"a", "t"})) == ['at', 'ta']
+
+
+def test_letter_mask_ok_subset():
+    assert wol.letter_mask("at") & ~wol.letter_mask("taw") == 0
+    assert wol.letter_mask("äs") & ~wol.letter_mask("as") != 0
+    assert wol.letter_mask("a4") & wol.OTHER_BIT
+
+
+def test_migrate_databases_ok_legacy_pickle(tmp_path):
+    wol.DB_BASE_PATH = f"{tmp_path}/legacy_dict_"
+    with open(wol.db_path_of(2, "pickle"), "wb") as handle:
+        pickle.dump({'at', 'au', 'wc'}, handle)
+    try:
+        assert sorted(wol.load(2, {"a", "t", "u"})) == ['at', 'au']
+        assert wol.migrate_databases(2, 3) == [2]
+        assert sorted(wol.open_database(2)) == ['at', 'au', 'wc']
+    finally:
+        wol.DB_BASE_PATH = DB_BASE_PATH
+
+
+def test_open_database_ok_warm_cache():
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.dump({'at', 'wc', 'bh', 'wm', 'wg', 'au'})
+    wol.invalidate()
+    hits, misses = wol.CACHE.hits, wol.CACHE.misses
+    wol.preload([2, 42])
+    assert wol.open_database(2) is wol.open_database(2)
+    assert (wol.CACHE.hits - hits, wol.CACHE.misses - misses) == (2, 1)
+    wol.invalidate([2])
+    assert wol.CACHE.stats()["entries"] == 0
+
+
+def test_solve_tuples_ok_jointly_fitting():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    assert wol.solve_tuples(list("absat"), [3, 2]) == [('abs', 'at')]
+    assert wol.solve_tuples(list("absat"), [3, 2], {3: ["_", "_", "t"]}) == []
+    assert wol.solve_tuples(list("abst"), [3, 2]) == []
+
+
+def test_solve_tuples_ok_equal_slots_without_permutations():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 2)
+    assert wol.solve_tuples(list("atau"), [2, 2]) == [('at', 'au')]
+    assert wol.solve_tuples(list("atat"), [2, 2]) == [('at', 'at')]
+
+
+def test_candidates_in_stanzas_ok_each_word_from_one_stanza():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 2)
+    assert sorted(wol.candidates_matching(2, list("abth"))) == ['at', 'bh']
+    assert wol.candidates_in_stanzas(2, [list("ab"), list("th")]) == []
+    assert wol.candidates_in_stanzas(2, [list("at"), list("bh")]) == ['at', 'bh']
+
+
+@pytest.mark.parametrize("engine", ["auto", "numpy", "python", "dawg"])
+def test_candidates_matching_ok_same_for_engines(engine, monkeypatch):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    monkeypatch.setattr(wol, "ENGINE", engine)
+    assert sorted(wol.candidates_matching(2, list("abth"))) == ['at', 'bh']
+    assert sorted(wol.candidates_matching(3, list("abst"), {0: "a", 2: "s"})) == ['abs']
+
+
+def test_derive_databases_ok_word_graph_only_if_asked(tmp_path):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = str(tmp_path / f"{LANGUAGE_GRAMMAR}_dict_")
+    try:
+        wol.derive_databases(2, 3)
+        assert not wol.open_database(3).has_section("dawg_letters")
+        assert wol.derive_databases(2, 3, dawg=True)[3]["status"] == "written"
+        assert wol.open_database(3).has_section("dawg_letters")
+        assert wol.derive_databases(2, 3, dawg=True) == {n: {"status": "current"} for n in (2, 3)}
+        assert wol.solve(["-i", "2", "3"]) == 0
+        assert not wol.open_database(3).has_section("dawg_letters")
+        assert wol.solve(["-i", "2", "3", "--dawg"]) == 0
+        assert wol.open_database(3).has_section("dawg_letters")
+    finally:
+        wol.DB_BASE_PATH = DB_BASE_PATH
+
+
+def test_vectorizes_ok_auto_only_when_paying_off(monkeypatch):
+    monkeypatch.setattr(wol.store, "numpy_loaded", lambda: False)
+    small, large = [None] * 7, range(wol.VECTORIZE_MIN_WORDS)
+    assert not wol.vectorizes(small) and wol.vectorizes(large)
+    monkeypatch.setattr(wol, "ENGINE", "numpy")
+    assert wol.vectorizes(small)
+    monkeypatch.setattr(wol, "ENGINE", "python")
+    assert not wol.vectorizes(large)
+    monkeypatch.setattr(wol, "ENGINE", "auto")
+    monkeypatch.setattr(wol.store, "numpy_loaded", lambda: True)
+    assert wol.vectorizes(small)
+
+
+def test_check_words_ok_normalized_per_length():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    checked = list(wol.check_words(["Äse", "äsa", "AU", "x", "abo"]))
+    assert checked == [("Äse", True), ("äsa", False), ("AU", True), ("x", False), ("abo", True)]
+    assert wol.is_word("öde") and not wol.is_word("ödem")
+
+
+def test_solve_tuples_ok_from_stanzas():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 2)
+    assert wol.solve_tuples(list("abth"), [2, 2]) == [('at', 'bh')]
+    assert wol.solve_tuples(list("abth"), [2, 2], stanzas=[list("ab"), list("th")]) == []
+
+
+def test_split_options_ok_leading_only():
+    assert wol.split_options(["-c", "a", "t", "2"]) == ({"combine": True}, ["a", "t", "2"])
+    assert wol.split_options(["a", "-c", "2"]) == ({}, ["a", "-c", "2"])
+    assert wol.split_options(["-w", "4", "-c", "a"]) == ({"workers": "4", "combine": True}, ["a"])
+
+
+def test_solve_tuples_ok_parallel_same_order():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    letters = list("abstauwcgmbh")
+    sequential = wol.solve_tuples(letters, [3, 2, 2])
+    assert sequential
+    assert wol.solve_tuples(letters, [3, 2, 2], workers=2) == sequential
+    assert wol.solve_tuples(letters, [3, 2, 2], workers=2, limit=2) == sequential[:2]
+
+
+@pytest.mark.parametrize("letters, n_slots", [("abstauwcgmbh", [3, 2, 2]), ("abstau__", [2, 2, 2]), ("abstauwc", [3, 3])])
+def test_search_tuples_ok_limit_is_prefix(letters, n_slots):
+    candidates = {2: ["ab", "at", "au", "bh", "cw", "gm", "ta", "wc"], 3: ["abs", "abt", "bas", "sab", "tau", "wut"]}
+    letters = list(letters)
+    full = wol.search_tuples(letters, n_slots, candidates)
+    assert len(full) > 3
+    for limit in range(len(full) + 2):
+        assert wol.search_tuples(letters, n_slots, candidates, limit=limit) == full[:limit]
+    halves = [range(0, 3), range(3, len(candidates[n_slots[0]]))]
+    assert [t for ks in halves for t in wol.search_tuples(letters, n_slots, candidates, ks, 3)][:3] == full[:3]
 
 
 def test_display_solutions_ok_minimal(capsys):
@@ -176,14 +347,14 @@ def test_parse_ok_minimal_stanzas():
     assert warnings == []
 
 
-def test_parse_ok_minimal_ignored_placeholder():
+def test_parse_ok_minimal_blank_tile():
     job = ["A", "_", "T", "2"]
     letters, stanzas, n_slots, placeholders, warnings, errors = wol.parse(job)
-    assert letters == [ch.lower() for ch in job[:3:2]]
+    assert letters == [ch.lower() for ch in job[:3]]
     assert stanzas == []
     assert n_slots == [int(job[-1])]
     assert placeholders == {}
-    assert warnings == ['WARNING Ignoring placeholder as letter (_) ...']
+    assert warnings == []
     assert errors == []
 
 
@@ -319,3 +490,244 @@ def test_solve_ok_minimal_with_placeholders(capsys):
     assert wol.solve(job) == 0
     out, err = capsys.readouterr()
     assert out.strip() == screen_display
+
+
+def test_solve_ok_combine(capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    job = ["--combine", "a", "b", "s", "a", "t", "2", "3"]
+    screen_display = (
+        '5 Letters available:\n'
+        '\n'
+        '    a b s a t\n'
+        '\n'
+        'Found 1 combinations of lengths(3, 2) from letters(a b s a t):\n'
+        '\n'
+        '    0) abs at'
+    )
+    assert wol.solve(job) == 0
+    out, err = capsys.readouterr()
+    assert out.strip() == screen_display
+
+
+def test_solve_ok_blank_tile(capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    job = ["a", "b", "_", "3"]
+    screen_display = (
+        '3 Letters available:\n'
+        '\n'
+        '    a b _\n'
+        '\n'
+        'Found 3 candidates of length(3) from letters(a b _):\n'
+        '\n'
+        '    0) abo (_=o)\n'
+        '    1) abs (_=s)\n'
+        '    2) abt (_=t)'
+    )
+    assert wol.solve(job) == 0
+    out, err = capsys.readouterr()
+    assert out.strip() == screen_display
+
+
+def test_solve_ok_combine_blank_tile_shared_by_tuple(capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    job = ["--combine", "a", "b", "s", "_", "t", "3", "2"]
+    assert wol.solve(job) == 0
+    out, err = capsys.readouterr()
+    assert out.strip().endswith('    0) abs at (_=a)')
+    result = wol.Solver().query_argv(job)
+    assert result.to_dict()["solutions"] == [("abs", "at")]
+    assert result.to_dict()["blanks"] == ["a"]
+
+
+def test_query_result_ok_reports_blanks():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    data = wol.Solver().query_argv(["a", "t", "_", "2"]).to_dict()
+    assert data["matches"] == [{"slots": 2, "words": ["at", "au"], "blanks": {"at": "", "au": "u"}}]
+
+
+def test_solve_nok_stanza_too_long(capsys):
+    job = ["--stanzas", "abcdefghijklm", "ab", "2"]
+    usage_feedback = (
+        f"ERROR More than {wol.PICTURE_LETTERS} letters given in stanza (abcdefghijklm)"
+    )
+    assert wol.solve(job) == 2
+    out, err = capsys.readouterr()
+    assert out.strip() == usage_feedback
+
+
+def test_solve_ok_stanzas(capsys):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 2)
+    job = ["-s", "ta", "hb", "2"]
+    screen_display = (
+        '4 Letters available:\n'
+        '\n'
+        '    t a\n'
+        '    h b\n'
+        '\n'
+        'Found 2 candidates of length(2) from letters(t a h b):\n'
+        '\n'
+        '    0) at\n'
+        '    1) bh'
+    )
+    assert wol.solve(job) == 0
+    out, err = capsys.readouterr()
+    assert out.strip() == screen_display
+
+
+def test_solver_query_argv_ok_structured():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    result = wol.Solver().query_argv(["a", "b", "s", "a", "t", "3", "2"])
+    assert result.ok
+    assert result.matches == [wol.SlotMatches(3, ['abs', 'abt']), wol.SlotMatches(2, ['at'])]
+    assert set(result.timings) == {"parse", "match:3", "match:2"}
+    assert result.to_dict() == {
+        "letters": ["a", "b", "s", "a", "t"],
+        "warnings": [],
+        "errors": [],
+        "slots": [3, 2],
+        "matches": [{"slots": 3, "words": ['abs', 'abt']}, {"slots": 2, "words": ['at']}],
+    }
+
+
+def test_solver_query_argv_nok_errors():
+    result = wol.Solver().query_argv(["A", "B", "12"])
+    assert not result.ok
+    assert result.errors == ['ERROR Only (2) characters given but requested (12) slots (12) ...']
+    assert result.matches == []
+
+
+def test_solver_query_ok_limit_and_count():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    solver = wol.Solver()
+    letters = list("abstauwcgmbh")
+    assert solver.count(2, letters) == 6
+    limited = solver.query(letters, [2], limit=2)
+    assert len(limited.matches[0].words) == 2
+    assert set(limited.matches[0].words) < set(solver.query(letters, [2]).matches[0].words)
+    assert solver.query(letters, [3, 2, 2], combine=True, limit=1).solutions == [('abs', 'at', 'bh')]
+
+
+def test_read_frequencies_ok_summed_lower_case():
+    wol.LANGUAGE_FREQUENCY_FILE_PATH = LANGUAGE_FREQUENCY_FILE_PATH
+    assert wol.read_frequencies()['at'] == 501
+    wol.LANGUAGE_FREQUENCY_FILE_PATH = "tests/fixture/text/missing.freq"
+    assert wol.read_frequencies() == {}
+
+
+def test_solver_query_ok_ranked_top():
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.LANGUAGE_FREQUENCY_FILE_PATH = LANGUAGE_FREQUENCY_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    solver = wol.Solver()
+    letters = list("abstauwcgmbh")
+    assert solver.query(letters, [2], rank="frequency", top=2).matches[0].words == ['at', 'wc']
+    assert solver.query(letters, [2], rank="frequency").matches[0].words == ['at', 'wc', 'au', 'bh', 'wg', 'wm']
+    assert solver.query(letters, [3], rank="usage", top=1).matches[0].words == ['abs']
+    assert solver.query(letters, [2], top=3).matches[0].words == ['at', 'au', 'bh']
+
+
+def test_solve_nok_unknown_ranking(capsys):
+    job = ["--rank", "beauty", "a", "t", "2"]
+    assert wol.solve(job) == 2
+    out, err = capsys.readouterr()
+    assert out.strip() == "ERROR Unknown ranking (beauty) - use one of (frequency, usage)"
+
+
+def test_solve_nok_top_not_a_count(capsys):
+    job = ["-k", "0", "a", "t", "2"]
+    assert wol.solve(job) == 2
+    out, err = capsys.readouterr()
+    assert out.strip() == "ERROR Top (0) is no positive count"
+
+
+def test_derive_databases_ok_incremental(tmp_path):
+    text_path = tmp_path / "words.dict"
+    text_path.write_text("AT\nAU\nAbo\nAbs\n", encoding="utf-8")
+    wol.LANGUAGE_TEXT_FILE_PATH = str(text_path)
+    wol.LANGUAGE_FREQUENCY_FILE_PATH = str(tmp_path / "missing.freq")
+    wol.DB_BASE_PATH = f"{tmp_path}/words_dict_"
+    try:
+        written = wol.derive_databases(2, 4)
+        assert written == {
+            2: {"status": "written", "added": 2, "removed": 0},
+            3: {"status": "written", "added": 2, "removed": 0},
+            4: {"status": "written", "added": 0, "removed": 0},
+        }
+        assert wol.derive_databases(2, 4) == {n: {"status": "current"} for n in range(2, 5)}
+        text_path.write_text("AT\nAU\nWC\nAbo\nAbs\n", encoding="utf-8")
+        report = wol.derive_databases(2, 4)
+        assert report[2] == {"status": "written", "added": 1, "removed": 0}
+        assert report[3] == report[4] == {"status": "current"}
+        wol.dump({'abt'})
+        assert wol.derive_databases(3, 3)[3] == {"status": "written", "added": 2, "removed": 1}
+        assert wol.derive_databases(2, 2, force=True)[2]["status"] == "written"
+        assert wol.read_manifest()["lengths"]["2"]["count"] == 3
+        text_path.write_text("AT\nAU\nWC\nAbo\nAbs\nXyzw\n", encoding="utf-8")
+        assert wol.derive_databases(2, 3) == {n: {"status": "current"} for n in (2, 3)}
+        assert wol.derive_databases(2, 4)[4] == {"status": "written", "added": 1, "removed": 0}
+        assert wol.is_word("xyzw")
+        assert wol.derive_databases(2, 4) == {n: {"status": "current"} for n in range(2, 5)}
+    finally:
+        wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+        wol.LANGUAGE_FREQUENCY_FILE_PATH = LANGUAGE_FREQUENCY_FILE_PATH
+        wol.DB_BASE_PATH = DB_BASE_PATH
+
+
+def test_get_language_ok_default_and_registered():
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    assert wol.get_language().db_base_path == DB_BASE_PATH
+    assert wol.get_language(wol.LANGUAGE_GRAMMAR) == wol.default_language()
+    assert wol.get_language("english").alphabet == wol.ASCII_LETTERS
+    with pytest.raises(ValueError, match="Unknown language"):
+        wol.get_language("klingon")
+
+
+def test_language_nok_alphabet_beyond_letter_masks(tmp_path):
+    alphabet = "".join(chr(0x100 + n) for n in range(64))
+    with pytest.raises(ValueError, match=r"has \(64\) letters - at most \(63\)"):
+        wol.Language("wide", alphabet, str(tmp_path / "wide.dict"), str(tmp_path / "wide_"))
+    assert wol.Language("wide", alphabet[:63], str(tmp_path / "wide.dict"), str(tmp_path / "wide_")).letter_bits[alphabet[62]] == 1 << 62
+
+
+def test_languages_ok_side_by_side(tmp_path):
+    wol.LANGUAGE_TEXT_FILE_PATH = LANGUAGE_TEXT_FILE_PATH
+    wol.DB_BASE_PATH = DB_BASE_PATH
+    wol.derive_databases(2, 3)
+    english = wol.Language(
+        "tenglish", wol.ASCII_LETTERS, "tests/fixture/text/tenglish.dict", f"{tmp_path}/tenglish_dict_"
+    )
+    wol.register_language(english)
+    try:
+        assert wol.derive_databases(2, 5, language=english)[5] == {"status": "written", "added": 1, "removed": 0}
+        assert wol.Solver(language=english).query_argv(["c", "a", "t", "3"]).matches[0].words == ['act', 'cat', 'tac']
+        assert wol.Solver().query_argv(["-l", "tenglish", "t", "a", "2"]).matches[0].words == ['at', 'ta']
+        assert wol.Solver().query_argv(["t", "a", "2"]).matches[0].words == ['at']
+        foreign = wol.Solver(language=english).query_argv(["ä", "t", "a", "2"])
+        assert foreign.letters == ["t", "a"]
+        assert wol.CACHE.stats()["entries"] >= 2
+        wol.evict_language(english)
+        assert not any(key.startswith(str(tmp_path)) for key in wol.CACHE._entries)
+    finally:
+        del wol.LANGUAGES["tenglish"]
+
+
+def test_solve_nok_unknown_language(capsys):
+    job = ["-l", "klingon", "a", "t", "2"]
+    assert wol.solve(job) == 2
+    out, err = capsys.readouterr()
+    assert out.strip().startswith("ERROR Unknown language (klingon) - use one of (english, ngerman")
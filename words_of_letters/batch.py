@@ -0,0 +1,117 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Solve many puzzles - one argument vector per line - in one process and emit JSON Lines."""
+import json
+import shlex
+import sys
+
+import words_of_letters.words_of_letters as wol
+from words_of_letters import instrument
+
+
+def split_line(line):
+    """Return the argument vector of a puzzle line and the errors splitting it."""
+    try:
+        return shlex.split(line), []
+    except ValueError as err:
+        return [line], [f"ERROR Cannot split puzzle line ({line}) - {err}"]
+
+
+def read_puzzles(handle):
+    """Yield (line number, argument vector) per puzzle line skipping blank and comment lines.
+
+    Lines shlex cannot split (like unbalanced quotes) are yielded as the line itself to fail on their own.
+    """
+    for number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            argv, errors = split_line(line)
+            yield number, line if errors else argv
+
+
+def solve_batch(puzzles):
+    """Solve the (line number, argument vector) puzzles and return one result dict per puzzle.
+
+    The queries of all puzzles are grouped by language and slot length so every database is scanned once.
+    """
+    entries, pending, queries = [], [], {}
+    for number, argv in puzzles:
+        if isinstance(argv, str):
+            argv, errors = split_line(argv)
+            entries.append((number, argv, wol.QueryResult([], errors=errors)))
+            continue
+        options, from_stanzas, letters, stanzas, n_slots, placeholders, warnings, errors = wol.prepare(argv)
+        result = wol.QueryResult(letters, stanzas, n_slots, warnings, errors[:1])
+        entries.append((number, argv, result))
+        if errors:
+            continue
+        sources = stanzas if from_stanzas else [letters]
+        for slots in sorted(set(n_slots)):
+            places = wol.places_of(placeholders.get(slots))
+            for source in sources:
+                queries.setdefault((options["language"], slots), []).append((len(pending), slots, (source, places)))
+        pending.append((result, options, from_stanzas, placeholders))
+
+    candidates = [{} for _ in pending]
+    failed = {}
+    for (language, slots), grouped in sorted(queries.items(), key=lambda item: (item[0][0].name, item[0][1])):
+        try:
+            found = wol.candidates_matching_many(slots, [query for *_, query in grouped], language)
+        except FileNotFoundError:
+            error = f"ERROR No database for word length ({slots})"
+        except (OSError, ValueError) as err:  # An unreadable database fails only the puzzles asking for its length
+            error = f"ERROR Unreadable database for word length ({slots}) - {err}"
+        else:
+            error = None
+        if error:
+            for index, *_ in grouped:
+                failed.setdefault(index, error)
+            continue
+        for (index, _, _), words in zip(grouped, found):
+            candidates[index].setdefault(slots, set()).update(words)
+
+    for index, (result, options, from_stanzas, placeholders) in enumerate(pending):
+        if index in failed:
+            result.errors = [failed[index]]
+            continue
+        per_slots = {slots: sorted(words) for slots, words in candidates[index].items()}
+        if "combine" in options:
+            result.solutions = wol.solve_tuples(
+                result.letters, result.n_slots, placeholders, result.stanzas if from_stanzas else None, per_slots
+            )
+        else:
+            rank, top = options.get("rank"), options.get("top")
+            if rank or top:
+                per_slots = {
+                    slots: wol.rank_words(slots, words, rank, top, options["language"]) for slots, words in per_slots.items()
+                }
+            result.matches = [wol.SlotMatches(slots, per_slots[slots]) for slots in result.n_slots]
+    return [{"line": number, "argv": argv, **result.to_dict()} for number, argv, result in entries]
+
+
+def solve_batch_parallel(puzzles, workers):
+    """Solve the puzzles in contiguous shards across a process pool keeping the input order."""
+    puzzles = list(puzzles)
+    if workers <= 1 or len(puzzles) < 2:
+        return solve_batch(puzzles)
+
+    from words_of_letters import parallel  # pylint: disable=import-outside-toplevel
+
+    with parallel.executor(workers) as pool:
+        shards = [puzzles[ks.start : ks.stop] for ks in parallel.shards(len(puzzles), workers)]
+        return [result for part in pool.map(solve_batch, shards) for result in part]
+
+
+def run(source="-", out=None, workers=1):
+    """Solve the puzzles read from the source path (or - for standard input) writing JSON Lines to out."""
+    out = sys.stdout if out is None else out
+    if source == "-":
+        results = solve_batch_parallel(read_puzzles(sys.stdin), workers)
+    else:
+        with open(source, "rt", encoding=wol.ENCODING) as handle:
+            results = solve_batch_parallel(read_puzzles(handle), workers)
+    for result in results:
+        out.write(json.dumps(result, ensure_ascii=False))
+        out.write("\n")
+    instrument.emit(cache=wol.CACHE.stats())
+    return 2 if any(result["errors"] for result in results) else 0
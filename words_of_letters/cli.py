@@ -1,16 +1,57 @@
 # -*- coding: utf-8 -*-
-# pylint: disable=line-too-long
-"""Add logical documentation here later TODO."""
+# pylint: disable=line-too-long,import-outside-toplevel
+"""Command line entry - validates puzzles before the solver and its databases are imported."""
 import os
 import sys
 
-from words_of_letters.words_of_letters import solve
+from words_of_letters import instrument
+from words_of_letters.rules import apply_option_rules, resolve_workers, split_options, validate
 
-DEBUG = os.getenv("WOL_DEBUG")
+DEBUG = instrument.MODE  # From WOL_DEBUG
+SERVER_ADDRESS = os.getenv("WOL_SERVER_ADDRESS", "wol.sock")
+COMMANDS = ("-i", "--init", "-m", "--migrate")
+
+
+def reject(argv):
+    """Report a puzzle for the default language failing validation and return 2 - None if valid or not a puzzle."""
+    options, rest = split_options(argv)
+    if "language" in options or "pattern" in options or rest and rest[0] in COMMANDS:
+        return None
+    *_, warnings, errors = validate(options, rest)
+    if not errors:
+        return None
+    for warning in warnings:
+        print(warning)
+    print(errors[0])
+    return 2
 
 
 # pylint: disable=expression-not-assigned
 def main(argv=None):
     """Process ... TODO."""
     argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in ("-b", "--batch", "--serve"):
+        options, rest = split_options(argv[1:])
+        errors = apply_option_rules(options, [])
+        if errors:
+            print(errors[0])
+            return 2
+    if argv and argv[0] in ("-b", "--batch"):
+        from words_of_letters.batch import run
+
+        return run(rest[0] if rest else "-", workers=resolve_workers(options.get("workers", 1)))
+    if argv and argv[0] == "--check":
+        from words_of_letters.words_of_letters import check
+
+        return check(argv[1:])
+    if argv and argv[0] == "--serve":
+        from words_of_letters import server
+
+        return server.run(rest[0] if rest else SERVER_ADDRESS, workers=resolve_workers(options.get("workers", 0)))
+    rejected = reject(argv)
+    if rejected is not None:
+        return rejected
+
+    from words_of_letters.words_of_letters import solve
+
     return solve(argv)
@@ -0,0 +1,158 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long,global-statement
+"""Opt in instrumentation of the hot paths enabled by the WOL_DEBUG environment variable.
+
+WOL_DEBUG=1 (or json) records wall and CPU time per phase and counters like the candidates before and
+after each filter and emits them together with the warm cache statistics as one JSON object per query
+on standard error. WOL_DEBUG=profile adds the top functions of a cProfile run and WOL_DEBUG=memory the
+peak and top allocations traced by tracemalloc. Disabled every phase is one shared no-op context.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+MODES = ("json", "profile", "memory")
+TOP_ENTRIES = 20
+
+NULL = nullcontext()
+
+MODE = None
+ENABLED = False
+PHASES = {}  # name -> [calls, wall seconds, cpu seconds]
+COUNTERS = {}
+CAPTURES = {}
+
+
+def mode_of(value):
+    """Return the mode for a WOL_DEBUG value - None for unset, empty or zero."""
+    value = (value or "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    return value if value in MODES else "json"
+
+
+def configure(value):
+    """Enable the mode for the WOL_DEBUG value and forget all records."""
+    global MODE, ENABLED
+    MODE = mode_of(value)
+    ENABLED = MODE is not None
+    reset()
+
+
+def reset():
+    """Forget all records."""
+    PHASES.clear()
+    COUNTERS.clear()
+    CAPTURES.clear()
+
+
+class Phase:
+    """Accumulate the wall and CPU time of a named phase."""
+
+    __slots__ = ("name", "wall", "cpu")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        entry = PHASES.setdefault(self.name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - self.wall
+        entry[2] += time.process_time() - self.cpu
+        return False
+
+
+def phase(name):
+    """Return a context timing the phase if enabled else the shared no-op context."""
+    return Phase(name) if ENABLED else NULL
+
+
+def count(name, n=1):
+    """Add n to the counter if enabled."""
+    if ENABLED:
+        COUNTERS[name] = COUNTERS.get(name, 0) + n
+
+
+def counted(name, stream):
+    """Pass the stream through counting its items if enabled."""
+    if not ENABLED:
+        return stream
+
+    def counting():
+        n = 0
+        try:
+            for item in stream:
+                n += 1
+                yield item
+        finally:
+            count(name, n)
+
+    return counting()
+
+
+@contextmanager
+def capture():
+    """Profile or trace the allocations of the block if the mode asks for it."""
+    if MODE == "profile":
+        import cProfile  # pylint: disable=import-outside-toplevel
+        import io  # pylint: disable=import-outside-toplevel
+        import pstats  # pylint: disable=import-outside-toplevel
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(TOP_ENTRIES)
+            CAPTURES["profile"] = text.getvalue()
+    elif MODE == "memory":
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started:
+                tracemalloc.stop()
+            CAPTURES["memory"] = {
+                "peak": peak,
+                "top": [str(stat) for stat in snapshot.statistics("lineno")[:TOP_ENTRIES]],
+            }
+    else:
+        yield
+
+
+def report(**extra):
+    """Return the records as dict with any extra entries."""
+    return {
+        "phases": {name: {"calls": calls, "wall": wall, "cpu": cpu} for name, (calls, wall, cpu) in PHASES.items()},
+        "counters": dict(COUNTERS),
+        **CAPTURES,
+        **extra,
+    }
+
+
+def emit(stream=None, **extra):
+    """Write the records as one JSON line (to standard error by default) and forget them."""
+    if not ENABLED:
+        return
+    import json  # pylint: disable=import-outside-toplevel
+
+    stream = sys.stderr if stream is None else stream
+    stream.write(json.dumps(report(**extra), ensure_ascii=False))
+    stream.write("\n")
+    reset()
+
+
+configure(os.getenv("WOL_DEBUG"))
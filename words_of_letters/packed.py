@@ -0,0 +1,164 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Block compressed word databases - all lengths of a language in one file read block by block.
+
+Layout: MAGIC, a little endian uint32 giving the size of the JSON header, the JSON header and the
+compressed blocks. Per length the sorted words are cut into blocks of BLOCK_WORDS words, front coded
+(a byte with the length of the prefix shared with the previous word, a byte with the length of the rest
+and the rest as UTF-8) and compressed with a stdlib codec. The header holds the block directory - offset,
+size, first word and number of words per block - so lookups decompress only the blocks they need.
+"""
+import json
+import lzma
+import os
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+
+from words_of_letters import store
+
+ENCODING = "utf-8"
+MAGIC = b"WOZ\x01"
+BLOCK_WORDS = 256
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+DEFAULT_CODEC = "zlib"
+BLOCK_CACHE = 64  # Decompressed blocks kept per open database
+
+
+def front_code(words):
+    """Return the front coded bytes of the sorted words."""
+    blob, previous = bytearray(), b""
+    for word in words:
+        encoded = word.encode(ENCODING)
+        shared = 0
+        limit = min(len(previous), len(encoded), 255)
+        while shared < limit and previous[shared] == encoded[shared]:
+            shared += 1
+        rest = encoded[shared:]
+        if len(rest) > 255:
+            raise ValueError(f"Word too long to front code ({word})")
+        blob += bytes((shared, len(rest)))
+        blob += rest
+        previous = encoded
+    return bytes(blob)
+
+
+def front_decode(blob):
+    """Return the words of front coded bytes."""
+    words, previous, n = [], b"", 0
+    while n < len(blob):
+        shared, size = blob[n], blob[n + 1]
+        previous = previous[:shared] + blob[n + 2 : n + 2 + size]
+        words.append(previous.decode(ENCODING))
+        n += 2 + size
+    return words
+
+
+def write_packed(path, buckets, alphabet, codec=DEFAULT_CODEC, block_words=BLOCK_WORDS):
+    """Write the word sets per length as one block compressed database."""
+    compress = CODECS[codec][0]
+    lengths, chunks, offset = {}, [], 0
+    for n, word_set in sorted(buckets.items()):
+        words = sorted(word_set)
+        blocks = []
+        for k in range(0, len(words), block_words):
+            block = words[k : k + block_words]
+            chunk = compress(front_code(block))
+            blocks.append([offset, len(chunk), block[0], len(block)])
+            chunks.append(chunk)
+            offset += len(chunk)
+        lengths[str(n)] = {"count": len(words), "blocks": blocks}
+    header = json.dumps({"alphabet": alphabet, "codec": codec, "lengths": lengths}, sort_keys=True).encode(ENCODING)
+    store.atomic_write(path, [MAGIC, store.HEADER_SIZE.pack(len(header)), header, *chunks])
+
+
+class PackedDatabase:
+    """Read only view on a block compressed database reading and decompressing blocks on demand."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            lead = os.pread(fd, len(MAGIC) + store.HEADER_SIZE.size, 0)
+            if lead[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is no packed word database")
+            (header_size,) = store.HEADER_SIZE.unpack_from(lead, len(MAGIC))
+            self.header = json.loads(os.pread(fd, header_size, len(lead)).decode(ENCODING))
+        except Exception:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._base = len(lead) + header_size
+        self.alphabet = self.header["alphabet"]
+        self.letter_bits = store.letter_bits_of(self.alphabet)
+        self.decompress = CODECS[self.header["codec"]][1]
+        self._directory = {int(n): entry["blocks"] for n, entry in self.header["lengths"].items()}
+        self._blocks = OrderedDict()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def lengths(self):
+        """Return the word lengths stored."""
+        return sorted(self._directory)
+
+    def count(self, word_length):
+        """Return the number of words of the length."""
+        return sum(block[3] for block in self._directory.get(word_length, ()))
+
+    def block(self, word_length, k):
+        """Return the words of block k of the length reading and decompressing it at most once while cached."""
+        key = (word_length, k)
+        if key in self._blocks:
+            self._blocks.move_to_end(key)
+            return self._blocks[key]
+        offset, size, _, _ = self._directory[word_length][k]
+        words = front_decode(self.decompress(os.pread(self._fd, size, self._base + offset)))
+        self._blocks[key] = words
+        if len(self._blocks) > BLOCK_CACHE:
+            self._blocks.popitem(last=False)
+        return words
+
+    def words(self, word_length, prefix=""):
+        """Stream the sorted words of the length starting with the prefix."""
+        for k in self.block_range(word_length, prefix):
+            for word in self.block(word_length, k):
+                if word.startswith(prefix):
+                    yield word
+
+    def block_range(self, word_length, prefix=""):
+        """Return the range of the blocks of the length that may hold words starting with the prefix."""
+        firsts = [block[2] for block in self._directory.get(word_length, ())]
+        if not prefix:
+            return range(len(firsts))
+        start = max(0, bisect_right(firsts, prefix) - 1)
+        stop = bisect_right(firsts, prefix + "\U0010ffff")
+        return range(start, max(start + 1, stop) if firsts else 0)
+
+    def __contains__(self, word):
+        """Tell if the word is stored decompressing at most one block."""
+        blocks = self.block_range(len(word), word)
+        return bool(blocks) and word in self.block(len(word), blocks[0])
+
+    def prefiltered(self, word_length, letter_set, blanks=0, prefix=""):
+        """Stream the words of the length starting with the prefix that use only letters of the letter set - up to blanks others."""
+        bits = self.letter_bits
+        m_mask = store.letter_mask(letter_set, bits)
+        lm, covers = store.letter_mask, store.covers
+        return (word for word in self.words(word_length, prefix) if covers(lm(word, bits), m_mask, blanks))
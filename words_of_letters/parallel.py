@@ -0,0 +1,37 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Process pool helpers - workers map the databases themselves so only queries and results are pickled."""
+from concurrent.futures import ProcessPoolExecutor
+
+import words_of_letters.words_of_letters as wol
+
+SHARDS_PER_WORKER = 4  # More shards than workers balance uneven shards while map keeps the order
+
+
+def configure(default_language, languages):
+    """Adopt the default and the registered languages of the parent process in a worker."""
+    wol.LANGUAGE_GRAMMAR = default_language.name
+    wol.LANGUAGE_TEXT_FILE_PATH = default_language.text_path
+    wol.LANGUAGE_FREQUENCY_FILE_PATH = default_language.frequency_path
+    wol.DB_BASE_PATH = default_language.db_base_path
+    wol.LANGUAGES.update(languages)
+
+
+def executor(workers):
+    """Create a process pool whose workers use the same databases as this process."""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=configure,
+        initargs=(wol.default_language(), dict(wol.LANGUAGES)),
+    )
+
+
+def shards(size, workers):
+    """Split range(size) into contiguous ranges in order."""
+    n_shards = max(1, min(size, workers * SHARDS_PER_WORKER))
+    step, extra = divmod(size, n_shards)
+    start = 0
+    for n in range(n_shards):
+        stop = start + step + (1 if n < extra else 0)
+        yield range(start, stop)
+        start = stop
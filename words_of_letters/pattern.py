@@ -0,0 +1,102 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Compile glob like word patterns - * any run, ? any letter, [abc] or [!abc] one of or none of some letters.
+
+A pattern between slashes like /^ab.*ung$/ is a regular expression searched in the words instead.
+Besides the matcher a compiled glob knows the letters at fixed positions from the start and from the
+end and the trigrams of its literal runs so the databases can narrow the candidates by their indices.
+"""
+import fnmatch
+import re
+from dataclasses import dataclass
+
+STAR, ANY, CLASS = "*", "?", "[]"
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """A compiled word pattern."""
+
+    text: str
+    matcher: re.Pattern
+    min_length: int = 0
+    fixed: bool = False  # Without stars a glob matches words of exactly the minimum length only
+    prefix: tuple = ()  # Letters at positions counted from the start
+    suffix: tuple = ()  # Letters at positions counted from the end (1 is the last)
+    grams: tuple = ()  # Trigrams every matching word contains
+    regex: bool = False  # Regular expressions are searched anywhere in the word - globs match the whole word
+
+    def lengths(self, first, last):
+        """Return the word lengths in [first, last] the pattern can match."""
+        if self.fixed:
+            return [self.min_length] if first <= self.min_length <= last else []
+        return list(range(max(first, self.min_length), last + 1))
+
+    def places(self, length):
+        """Map the fixed positions of words of the length to their letters."""
+        places = dict(self.prefix)
+        places.update((length - k, ch) for k, ch in self.suffix)
+        return places
+
+    def matches(self, word):
+        """Decide if the word matches the pattern."""
+        if self.regex:
+            return self.matcher.search(word) is not None
+        return self.matcher.fullmatch(word) is not None
+
+
+def tokens(glob):
+    """Split a glob into literal letters and the STAR, ANY and CLASS wildcards."""
+    found, n = [], 0
+    while n < len(glob):
+        ch = glob[n]
+        if ch == "[":
+            end = n + 1
+            if end < len(glob) and glob[end] == "!":
+                end += 1
+            if end < len(glob) and glob[end] == "]":
+                end += 1
+            end = glob.find("]", end)
+            if end >= 0:
+                found.append(CLASS)
+                n = end + 1
+                continue
+        found.append(ch)
+        n += 1
+    return found
+
+
+def literal(token):
+    return token not in (STAR, ANY, CLASS)
+
+
+def compile_pattern(text):
+    """Compile the pattern text or raise ValueError."""
+    if len(text) > 1 and text.startswith("/") and text.endswith("/"):
+        try:  # As written since lower casing would flip escapes like \D into \d
+            return Pattern(text, re.compile(text[1:-1], re.IGNORECASE), regex=True)
+        except re.error as err:
+            raise ValueError(f"ERROR Invalid pattern ({text}) - {err}") from None
+    text = text.lower()
+    if not text:
+        raise ValueError("ERROR Empty pattern")
+    glob = tokens(text)
+    stars = [n for n, token in enumerate(glob) if token == STAR]
+    head = glob[: stars[0]] if stars else glob
+    tail = glob[stars[-1] + 1 :] if stars else []
+    runs, run = [], []
+    for token in glob + [STAR]:
+        if literal(token):
+            run.append(token)
+        else:
+            runs.append("".join(run))
+            run = []
+    return Pattern(
+        text,
+        re.compile(fnmatch.translate(text)),
+        min_length=sum(1 for token in glob if token != STAR),
+        fixed=not stars,
+        prefix=tuple((c, token) for c, token in enumerate(head) if literal(token)),
+        suffix=tuple((len(tail) - c, token) for c, token in enumerate(tail) if literal(token)),
+        grams=tuple(sorted({run[c : c + 3] for run in runs for c in range(len(run) - 2)})),
+    )
@@ -0,0 +1,112 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Persistent query results in a local sqlite file shared by concurrent processes.
+
+Keys are digests of the canonical query including the versions of the databases it read so results of
+rewritten databases are never served. The least recently used results go once the stored results exceed
+the byte budget. Any sqlite trouble like a locked or unwritable file makes the cache miss and never fails
+the query.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+ENCODING = "utf-8"
+TIMEOUT_SECONDS = 5.0
+SCHEMA = "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+
+
+def digest_of(query):
+    """Return the key of the JSON ready canonical query."""
+    return hashlib.sha256(json.dumps(query, sort_keys=True, ensure_ascii=False).encode(ENCODING)).hexdigest()
+
+
+class ResultCache:
+    """Size bounded least recently used store of JSON ready results."""
+
+    def __init__(self, path, budget):
+        self.path = path
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+
+    def connect(self):
+        """Open the database on first use in write ahead log mode for concurrent readers and writers."""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=TIMEOUT_SECONDS, isolation_level=None)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(SCHEMA)
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def get(self, key):
+        """Return the result stored for the key or None."""
+        try:
+            connection = self.connect()
+            row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """Store the result for the key evicting the least recently used results beyond the budget."""
+        blob = json.dumps(value, ensure_ascii=False).encode(ENCODING)
+        if len(blob) > self.budget:
+            return
+        try:
+            connection = self.connect()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, used) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time()),
+                )
+                self.evict(connection)
+        except sqlite3.Error:
+            pass
+
+    def evict(self, connection):
+        """Delete the least recently used results until the stored bytes fit into the budget."""
+        (size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if size <= self.budget:
+            return
+        doomed, excess = [], size - self.budget
+        for key, entry_size in connection.execute("SELECT key, size FROM results ORDER BY used"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= entry_size
+        connection.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def clear(self):
+        """Forget all results."""
+        try:
+            self.connect().execute("DELETE FROM results")
+        except sqlite3.Error:
+            pass
+
+    def stats(self):
+        """Return the counters and the occupancy of the cache."""
+        try:
+            entries, size = self.connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        except sqlite3.Error:
+            entries = size = 0
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "size": size, "budget": self.budget}
+
+    def close(self):
+        """Close the database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
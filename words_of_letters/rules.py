@@ -0,0 +1,164 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Parse and validate puzzles - light enough for the command line to reject bad input before loading the solver."""
+import os
+
+ASCII_LETTERS = "abcdefghijklmnopqrstuvwxyz"  # Spelled out as importing string pulls in re
+DIGITS = "0123456789"
+EXTRA_LETTERS = ("ä", "ö", "ü", "ß")
+
+PICTURE_LETTERS = 12
+SWIPE_LETTERS = 36
+MAX_LETTERS = SWIPE_LETTERS
+MAX_SLOTS = 8
+
+OPTIONS = {"-c": "combine", "--combine": "combine", "-s": "stanzas", "--stanzas": "stanzas"}
+VALUE_OPTIONS = {
+    "-w": "workers",
+    "--workers": "workers",
+    "-r": "rank",
+    "--rank": "rank",
+    "-k": "top",
+    "--top": "top",
+    "-l": "language",
+    "--language": "language",
+    "-p": "pattern",
+    "--pattern": "pattern",
+}
+RANKINGS = ("frequency", "usage")
+BLANK = "_"  # Blank tile among the letters or open position in a placeholder
+
+ALPHABET = ASCII_LETTERS + "".join(EXTRA_LETTERS)
+
+
+def resolve_workers(workers):
+    """Return the number of worker processes to use - all CPUs for zero or less."""
+    workers = int(workers)
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def split_options(argv):
+    """Split the leading options (flags map to True) from the puzzle arguments."""
+    options, rest = {}, list(argv)
+    while rest and (rest[0] in OPTIONS or rest[0] in VALUE_OPTIONS and len(rest) > 1):
+        flag = rest.pop(0)
+        if flag in OPTIONS:
+            options[OPTIONS[flag]] = True
+        else:
+            options[VALUE_OPTIONS[flag]] = rest.pop(0)
+    return options, rest
+
+
+def parse(argv, alphabet=None):
+    alphabet = ALPHABET if alphabet is None else alphabet
+    letters = []
+    stanzas = []
+    n_slots = []
+    placeholders = {}
+    warnings, errors = [], []
+
+    if len(argv) < 2:
+        errors.append(
+            "Usage: script <letters> ... <slots> [<placeholders> <slots> ...]\n"
+            f"Received ({argv}) argument vector"
+        )
+        return letters, stanzas, n_slots, placeholders, warnings, errors
+
+    for group in argv:
+        if len(group) > 1:
+            if all(l_char in alphabet for l_char in group.lower()):
+                stanzas.append([char.lower() for char in group])
+
+    slot_active = False
+    for chars in argv:
+        if all(c not in DIGITS for c in chars):
+            for char in chars:
+                l_char = char.lower()
+                if l_char in alphabet or l_char == BLANK:
+                    if not slot_active:
+                        letters.append(l_char)
+                    else:
+                        cs = n_slots[-1]
+                        placeholders.setdefault(cs, []).append(l_char)
+                        ph_cs = placeholders[cs]
+                        if len(ph_cs) > cs:
+                            errors.append(f"ERROR {len(ph_cs) - cs} too many placeholders ({ph_cs}) for slot {cs}")
+                            return letters, stanzas, n_slots, placeholders, warnings, errors
+        elif all(c in DIGITS for c in chars) and 0 < int(chars) < SWIPE_LETTERS:
+            n_slots.append(int(chars))
+            slot_active = True
+        else:
+            warnings.append(f"WARNING Ignoring characters/slot ({chars}) ...")
+
+    return letters, stanzas, n_slots, placeholders, warnings, errors
+
+
+def apply_rules(letters, stanzas, n_slots, placeholders, warnings, errors):
+    relay_dimensions = letters, stanzas, n_slots, placeholders, warnings
+    if errors:
+        return *relay_dimensions, errors
+    n_letters = len(letters)
+    if n_letters > SWIPE_LETTERS:
+        errors.append(f"ERROR More than {SWIPE_LETTERS} letters given ({n_letters})")
+        return *relay_dimensions, errors
+
+    if len(n_slots) > MAX_SLOTS:
+        errors.append(f"ERROR More than {MAX_SLOTS} slots given ({len(n_slots)})")
+        return *relay_dimensions, errors
+
+    sum_slots = sum(n_slots)
+    if sum_slots > n_letters:
+        errors.append(
+            f"ERROR Only ({n_letters}) characters given but requested ({sum_slots}) slots ({', '.join(str(n) for n in n_slots)}) ..."
+        )
+        return *relay_dimensions, errors
+
+    if not sum_slots:
+        errors.append(
+            f"ERROR ({n_letters}) character{'' if n_letters == 1 else 's'} given but requested no ({sum_slots}) slots ({', '.join(str(n) for n in n_slots)}) ..."
+        )
+        return *relay_dimensions, errors
+
+    n_slots.sort(reverse=True)
+    return letters, stanzas, n_slots, placeholders, warnings, errors
+
+
+def apply_stanza_rules(stanzas, errors):
+    if errors:
+        return errors
+    for stanza in stanzas:
+        if len(stanza) > PICTURE_LETTERS:
+            errors.append(f"ERROR More than {PICTURE_LETTERS} letters given in stanza ({''.join(stanza)})")
+            break
+    return errors
+
+
+def apply_option_rules(options, errors):
+    if errors:
+        return errors
+    if options.get("rank", RANKINGS[0]) not in RANKINGS:
+        errors.append(f"ERROR Unknown ranking ({options['rank']}) - use one of ({', '.join(RANKINGS)})")
+    elif "top" in options:
+        if not str(options["top"]).isdigit() or not int(options["top"]):
+            errors.append(f"ERROR Top ({options['top']}) is no positive count")
+        else:
+            options["top"] = int(options["top"])
+    if "workers" in options and not errors:
+        if not str(options["workers"]).lstrip("-").isdigit():
+            errors.append(f"ERROR Workers ({options['workers']}) is no count - zero or less for all CPUs")
+        else:
+            options["workers"] = int(options["workers"])
+    return errors
+
+
+def validate(options, argv, alphabet=None):
+    """Parse and validate the puzzle arguments given the split options.
+
+    Returns from_stanzas, letters, stanzas, n_slots, placeholders, warnings and errors.
+    """
+    letters, stanzas, n_slots, placeholders, warnings, errors = apply_rules(*parse(argv, alphabet))
+    from_stanzas = "stanzas" in options and any(len(s) > 1 for s in stanzas)
+    if from_stanzas:
+        errors = apply_stanza_rules(stanzas, errors)
+    errors = apply_option_rules(options, errors)
+    return from_stanzas, letters, stanzas, n_slots, placeholders, warnings, errors
@@ -0,0 +1,88 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Long lived solver serving JSON Lines puzzles over a Unix socket or localhost TCP.
+
+Every request line is a JSON object with an argv list in the format the command line accepts, e.g.
+{"argv": ["a", "t", "2"]}, and is answered by one line holding the result object batch mode emits
+without its line number. Requests failing in a worker are answered with their errors.
+Solving runs in a process pool whose workers keep their databases warm across requests.
+"""
+import asyncio
+import json
+import sys
+
+import words_of_letters.batch as batch
+from words_of_letters import parallel
+
+ENCODING = "utf-8"
+
+
+def solve_one(argv):
+    """Solve a single puzzle in a worker returning the result without the batch line number."""
+    result = batch.solve_batch([(1, argv)])[0]
+    del result["line"]
+    return result
+
+
+def parse_request(line):
+    """Return the argument vector of a request line or raise ValueError."""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as err:
+        raise ValueError(f"ERROR Request is no JSON ({err})") from err
+    argv = request.get("argv") if isinstance(request, dict) else None
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        raise ValueError("ERROR Request lacks an argv list of strings")
+    return argv
+
+
+async def handle(reader, writer, pool):
+    """Answer the requests of one client line by line until it disconnects."""
+    loop = asyncio.get_running_loop()
+    try:
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            try:
+                argv = parse_request(line.decode(ENCODING))
+            except (ValueError, UnicodeDecodeError) as err:
+                result = {"errors": [str(err)]}
+            else:
+                try:
+                    result = await loop.run_in_executor(pool, solve_one, argv)
+                except Exception as err:  # pylint: disable=broad-except # Answer the client and keep serving
+                    result = {"argv": argv, "errors": [f"ERROR Solving failed ({type(err).__name__}: {err})"]}
+            writer.write(json.dumps(result, ensure_ascii=False).encode(ENCODING) + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def start(address, pool):
+    """Start serving on a Unix socket path or on a host:port address."""
+
+    async def client(reader, writer):
+        await handle(reader, writer, pool)
+
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+        return await asyncio.start_server(client, host or "127.0.0.1", int(port))
+    return await asyncio.start_unix_server(client, address)
+
+
+async def serve(address, workers):
+    """Serve until cancelled."""
+    with parallel.executor(workers) as pool:
+        server = await start(address, pool)
+        async with server:
+            print(f"Serving on ({address}) with ({workers}) workers ...", file=sys.stderr)
+            await server.serve_forever()
+
+
+def run(address, workers=1):
+    """Serve from the command line until interrupted."""
+    try:
+        asyncio.run(serve(address, workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,697 @@
+# encoding: utf-8
+# pylint: disable=invalid-name,line-too-long
+"""Memory mapped word databases - one file per word length.
+
+Layout: MAGIC, a little endian uint32 giving the size of the JSON header, the JSON header and the
+8 byte aligned sections named in the header. The words are ordered by letter multiset signature
+so every anagram group is a contiguous id range described by the groups sections. The optional dawg
+sections hold the minimal acyclic automaton of the words with all words of the length ending in node 0
+and edges labelled by index into the alphabet extended by the other characters of the words and the
+trigram sections the ids of the words per letter trigram for pattern queries. The sorted 64 bit word
+hashes with their ids and a Bloom filter over the hashes answer membership queries.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import cached_property
+
+ENCODING = "utf-8"
+MAGIC = b"WOL\x01"
+FORMAT = 5  # Bump whenever the sections written change so derived databases get rebuilt
+HEADER_SIZE = struct.Struct("<I")
+ALIGN = 8
+OTHER_BIT = 1 << 63  # Any character outside the alphabet can never be matched by letter material
+MAX_ALPHABET = 63  # Letters with a mask bit below OTHER_BIT
+OTHER_INDEX = 255  # Position letter of characters outside the alphabet
+BLOOM_BITS_PER_WORD = 10
+BLOOM_HASHES = 7  # About one percent false positives at ten bits per word
+BLANK = "_"  # Blank tile in the letter material standing for any letter of the alphabet
+MAX_FREQUENCY = (1 << 32) - 1
+
+UNLOADED = object()
+numpy = UNLOADED  # Imported on first vectorized match so plain queries start fast
+
+
+def numpy_loaded():
+    """Tell if NumPy is imported already so vectorizing costs no import."""
+    return numpy is not UNLOADED and numpy is not None or "numpy" in sys.modules
+
+
+def numpy_module():
+    """Return NumPy importing it on first use - None if it is not installed."""
+    global numpy  # pylint: disable=global-statement
+    if numpy is UNLOADED:
+        try:
+            import numpy as module  # pylint: disable=import-outside-toplevel
+        except ImportError:  # pragma: no cover
+            module = None
+        numpy = module
+    return numpy
+
+
+def letter_bits_of(alphabet):
+    """Map every letter of the alphabet to its bit."""
+    return {ch: 1 << n for n, ch in enumerate(alphabet)}
+
+
+def letter_mask(chars, letter_bits):
+    """Return the letter presence bitmask of the chars."""
+    mask = 0
+    for ch in chars:
+        mask |= letter_bits.get(ch, OTHER_BIT)
+    return mask
+
+
+def signature(word):
+    """Return the letter multiset signature (the sorted letters) of the word."""
+    return "".join(sorted(word))
+
+
+def material_counts(material):
+    """Return the letter counts of the material without blanks and the number of blanks."""
+    return {u_ch: material.count(u_ch) for u_ch in set(material) if u_ch != BLANK}, material.count(BLANK)
+
+
+def fits(word, l_c, blanks=0):
+    """Decide if the letter counts of the word fit into the letter counts of the material and blanks."""
+    if not blanks:
+        return all(l_c.get(u_ch, 0) >= word.count(u_ch) for u_ch in set(word))
+    return sum(max(0, word.count(u_ch) - l_c.get(u_ch, 0)) for u_ch in set(word)) <= blanks
+
+
+def covers(mask, m_mask, blanks=0):
+    """Decide if the letters of the mask missing from the material mask may be blanks - never other characters."""
+    missing = mask & ~m_mask
+    return not missing or blanks > 0 and not missing & OTHER_BIT and missing.bit_count() <= blanks
+
+
+def blanks_of(words, material):
+    """Return the sorted letters the blanks of the material stand for in the words."""
+    l_c, _ = material_counts(material)
+    needed = {}
+    for word in words:
+        for ch in word:
+            needed[ch] = needed.get(ch, 0) + 1
+    return "".join(sorted(ch * (n - l_c.get(ch, 0)) for ch, n in needed.items() if n > l_c.get(ch, 0)))
+
+
+def atomic_write(path, chunks):
+    """Write the chunks to a temporary sibling and move it in place so readers never see partial files."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def layout(meta, sections):
+    """Yield the byte chunks of a database file from the meta data and the named sections."""
+    placed, offset = {}, 0
+    for name, payload in sections.items():
+        placed[name] = [offset, len(payload)]
+        offset += len(payload) + (-len(payload) % ALIGN)
+    header = dict(meta, byteorder=sys.byteorder, sections=placed)
+    blob = json.dumps(header, sort_keys=True).encode(ENCODING)
+    lead = len(MAGIC) + HEADER_SIZE.size + len(blob)
+    blob += b" " * (-lead % ALIGN)
+    yield MAGIC
+    yield HEADER_SIZE.pack(len(blob))
+    yield blob
+    for payload in sections.values():
+        yield payload
+        yield b"\0" * (-len(payload) % ALIGN)
+
+
+def dawg_of(words, letter_index):
+    """Return the edge bounds per node, edge labels (alphabet indices) and edge targets of the minimal word graph.
+
+    The words have to be sorted and of the same length. Suffix sharing nodes are merged by registering
+    every node under its edges - node 0 is the final node and the last node the root.
+    """
+    bounds, labels, targets = array("I", [0, 0]), array("B"), array("I")
+    registry = {(): 0}
+    word_length = len(words[0]) if words else 0
+
+    def build(lo, hi, depth):
+        if depth == word_length:
+            return 0
+        edges, start = [], lo
+        for n in range(lo + 1, hi + 1):
+            if n == hi or words[n][depth] != words[start][depth]:
+                edges.append((letter_index.get(words[start][depth], OTHER_INDEX), build(start, n, depth + 1)))
+                start = n
+        key = tuple(edges)
+        if key not in registry:
+            registry[key] = len(registry)
+            for label, target in edges:
+                labels.append(label)
+                targets.append(target)
+            bounds.append(len(labels))
+        return registry[key]
+
+    build(0, len(words), 0)
+    return bounds, labels, targets
+
+
+def trigram_key(gram, letter_index):
+    """Return the index key of three letters or None if any is outside the alphabet."""
+    key = 0
+    for ch in gram:
+        if ch not in letter_index:
+            return None
+        key = key * len(letter_index) + letter_index[ch]
+    return key
+
+
+def intersect(postings):
+    """Return the ids common to all sorted id postings - shortest first.
+
+    Each survivor is bisected into the longer postings from where the previous one was found so the cost
+    follows the shortest posting and not the longer ones.
+    """
+    postings = sorted(postings, key=len)
+    survivors = list(postings[0])
+    for other in postings[1:]:
+        kept, lo, size = [], 0, len(other)
+        for n in survivors:
+            lo = bisect_left(other, n, lo)
+            if lo == size:
+                break
+            if other[lo] == n:
+                kept.append(n)
+        survivors = kept
+        if not survivors:
+            break
+    return survivors
+
+
+def word_hash(word):
+    """Return the 64 bit hash of the word."""
+    return int.from_bytes(hashlib.blake2b(word.encode(ENCODING), digest_size=8).digest(), "little")
+
+
+def bloom_positions(h, n_bits):
+    """Yield the bit positions of the hash in a Bloom filter of n_bits by double hashing."""
+    h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+    for k in range(BLOOM_HASHES):
+        yield (h1 + k * h2) % n_bits
+
+
+def bloom_of(hashes, count):
+    """Return the Bloom filter bits of the hashes for count words."""
+    n_bits = max(64, -(-count * BLOOM_BITS_PER_WORD // 64) * 64)
+    bloom = bytearray(n_bits // 8)
+    for h in hashes:
+        for p in bloom_positions(h, n_bits):
+            bloom[p >> 3] |= 1 << (p & 7)
+    return bytes(bloom)
+
+
+def write_database(path, word_set, alphabet, frequencies=None, dawg=False):
+    """Write the words of one length as memory mappable database - optionally with word frequencies and word graph."""
+    letter_bits = letter_bits_of(alphabet)
+    letter_index = {ch: n for n, ch in enumerate(alphabet)}
+    words = sorted(word_set, key=lambda w: (signature(w), w))
+    offsets, masks, bounds, group_masks = array("I", [0]), array("Q"), array("I"), array("Q")
+    blob, counts, letters = bytearray(), bytearray(), bytearray()
+    previous = None
+    for n, word in enumerate(words):
+        blob += word.encode(ENCODING)
+        offsets.append(len(blob))
+        mask = letter_mask(word, letter_bits)
+        masks.append(mask)
+        row = bytearray(len(alphabet))
+        for ch in word:
+            if ch in letter_index:
+                row[letter_index[ch]] += 1
+        counts += row
+        letters += bytes(letter_index.get(ch, OTHER_INDEX) for ch in word)
+        sig = signature(word)
+        if sig != previous:
+            bounds.append(n)
+            group_masks.append(mask)
+            previous = sig
+    bounds.append(len(words))
+    word_length = len(words[0]) if words else 0
+    postings = [[] for _ in range(word_length * len(alphabet))]
+    for n, word in enumerate(words):
+        for c, ch in enumerate(word):
+            if ch in letter_index:
+                postings[c * len(alphabet) + letter_index[ch]].append(n)
+    posting_bounds, posting_ids = array("I", [0]), array("I")
+    for ids in postings:
+        posting_ids.extend(ids)
+        posting_bounds.append(len(posting_ids))
+    trigrams = {}
+    for n, word in enumerate(words):
+        for key in sorted({trigram_key(word[c : c + 3], letter_index) for c in range(len(word) - 2)} - {None}):
+            trigrams.setdefault(key, []).append(n)
+    trigram_keys, trigram_bounds, trigram_ids = array("I", sorted(trigrams)), array("I", [0]), array("I")
+    for key in trigram_keys:
+        trigram_ids.extend(trigrams[key])
+        trigram_bounds.append(len(trigram_ids))
+    meta = {"alphabet": alphabet, "count": len(words), "word_length": word_length}
+    sections = {
+        "offsets": offsets.tobytes(),
+        "words": bytes(blob),
+        "masks": masks.tobytes(),
+        "group_bounds": bounds.tobytes(),
+        "group_masks": group_masks.tobytes(),
+        "counts": bytes(counts),
+        "letters": bytes(letters),
+        "posting_bounds": posting_bounds.tobytes(),
+        "posting_ids": posting_ids.tobytes(),
+        "trigram_keys": trigram_keys.tobytes(),
+        "trigram_bounds": trigram_bounds.tobytes(),
+        "trigram_ids": trigram_ids.tobytes(),
+    }
+    if dawg:
+        others = "".join(sorted({ch for word in words for ch in word} - set(alphabet)))
+        meta["dawg_alphabet"] = alphabet + others[: OTHER_INDEX - len(alphabet)]  # Any further characters share OTHER_INDEX
+        dawg_bounds, dawg_letters, dawg_targets = dawg_of(sorted(words), {ch: n for n, ch in enumerate(meta["dawg_alphabet"])})
+        sections["dawg_bounds"] = dawg_bounds.tobytes()
+        sections["dawg_letters"] = dawg_letters.tobytes()
+        sections["dawg_targets"] = dawg_targets.tobytes()
+    hashed = sorted((word_hash(word), n) for n, word in enumerate(words))
+    sections["hashes"] = array("Q", (h for h, _ in hashed)).tobytes()
+    sections["hash_ids"] = array("I", (n for _, n in hashed)).tobytes()
+    sections["bloom"] = bloom_of((h for h, _ in hashed), len(words))
+    if frequencies:
+        counts_of = array("I", (min(frequencies.get(word, 0), MAX_FREQUENCY) for word in words))
+        by_frequency = array("I", sorted(range(len(words)), key=lambda n: (-counts_of[n], words[n])))
+        sections["frequencies"] = counts_of.tobytes()
+        sections["by_frequency"] = by_frequency.tobytes()
+    atomic_write(path, layout(meta, sections))
+
+
+class Database:
+    """Read only view on a memory mapped word database."""
+
+    def __init__(self, path):
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            if self._map[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is no word database")
+            (header_size,) = HEADER_SIZE.unpack_from(self._map, len(MAGIC))
+            base = len(MAGIC) + HEADER_SIZE.size
+            self.header = json.loads(self._map[base : base + header_size].decode(ENCODING))
+            if self.header["byteorder"] != sys.byteorder:
+                raise ValueError(f"{path} was written for {self.header['byteorder']} endian machines")
+            self._base = base + header_size
+            self.alphabet = self.header["alphabet"]
+            self.letter_bits = letter_bits_of(self.alphabet)
+            self.letter_index = {ch: n for n, ch in enumerate(self.alphabet)}
+            self.count = self.header["count"]
+            self._offsets = self.section("offsets", "I")
+            self._words = self.section("words")
+            self._masks = self.section("masks", "Q")
+            self._bounds = self.section("group_bounds", "I")
+            self._group_masks = self.section("group_masks", "Q")
+            self._counts = self.section("counts") if self.has_section("counts") else None
+            self._letters = self.section("letters") if self.has_section("letters") else None
+            if self.has_section("frequencies"):
+                self._frequencies = self.section("frequencies", "I")
+                self._by_frequency = self.section("by_frequency", "I")
+            else:
+                self._frequencies = self._by_frequency = None
+            if self.has_section("posting_bounds"):
+                self._posting_bounds = self.section("posting_bounds", "I")
+                self._posting_ids = self.section("posting_ids", "I")
+            else:
+                self._posting_bounds = self._posting_ids = None
+            if self.has_section("hashes"):
+                self._hashes = self.section("hashes", "Q")
+                self._hash_ids = self.section("hash_ids", "I")
+                self._bloom = self.section("bloom")
+            else:
+                self._hashes = self._hash_ids = self._bloom = None
+            if self.has_section("trigram_keys"):
+                self._trigram_keys = self.section("trigram_keys", "I")
+                self._trigram_bounds = self.section("trigram_bounds", "I")
+                self._trigram_ids = self.section("trigram_ids", "I")
+            else:
+                self._trigram_keys = self._trigram_bounds = self._trigram_ids = None
+            if self.has_section("dawg_letters"):
+                self._dawg_bounds = self.section("dawg_bounds", "I")
+                self._dawg_letters = self.section("dawg_letters")
+                self._dawg_targets = self.section("dawg_targets", "I")
+            else:
+                self._dawg_bounds = self._dawg_letters = self._dawg_targets = None
+        except Exception:
+            self.close()
+            raise
+
+    def has_section(self, name):
+        """Tell if the database carries the named section - older databases lack later additions."""
+        return name in self.header["sections"]
+
+    def section(self, name, fmt=None):
+        """Return a zero copy view on the named section - typed if a format is given."""
+        offset, size = self.header["sections"][name]
+        view = memoryview(self._map)[self._base + offset : self._base + offset + size]
+        if fmt:
+            view = view.cast(fmt)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        """Release all views and the mapping."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if not self._map.closed:
+            self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def size(self):
+        """Return the mapped bytes."""
+        return 0 if self._map.closed else len(self._map)
+
+    def __iter__(self):
+        return (self.word(n) for n in range(self.count))
+
+    def word(self, n):
+        """Decode the word with id n."""
+        return str(self._words[self._offsets[n] : self._offsets[n + 1]], ENCODING)
+
+    def find(self, word):
+        """Return the id of the word or None by bisecting the (signature, word) ordered ids."""
+        key = (signature(word), word)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = self.word(mid)
+            if (signature(candidate), candidate) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.count and self.word(lo) == word else None
+
+    def __contains__(self, word):
+        """Tell if the word is in the database - the Bloom filter answers most negatives without a search."""
+        if self._hashes is None:
+            return self.find(word) is not None
+        h = word_hash(word)
+        bloom, n_bits = self._bloom, self._bloom.nbytes * 8
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for k in range(BLOOM_HASHES):
+            p = (h1 + k * h2) % n_bits
+            if not bloom[p >> 3] >> (p & 7) & 1:
+                return False
+        hashes, word_of = self._hashes, self.word
+        k = bisect_left(hashes, h)
+        while k < len(hashes) and hashes[k] == h:
+            if word_of(self._hash_ids[k]) == word:
+                return True
+            k += 1
+        return False
+
+    @property
+    def ranks_frequency(self):
+        """Tell if the database carries word frequencies."""
+        return self._frequencies is not None
+
+    def frequency(self, word):
+        """Return the frequency of the word - zero for unknown words or without frequencies."""
+        if self._frequencies is None:
+            return 0
+        n = self.find(word)
+        return 0 if n is None else self._frequencies[n]
+
+    def by_frequency(self, material, places=None):
+        """Yield the matching words most frequent first so the first k are the top k."""
+        l_c, blanks = material_counts(material)
+        m_mask = self.mask(l_c)
+        masks, word = self._masks, self.word
+        for n in self._by_frequency:
+            if covers(masks[n], m_mask, blanks):
+                candidate = word(n)
+                if fits(candidate, l_c, blanks) and (not places or all(candidate[c] == m for c, m in places.items())):
+                    yield candidate
+
+    def mask(self, chars):
+        """Return the letter presence bitmask of the chars for the alphabet of the database."""
+        return letter_mask(chars, self.letter_bits)
+
+    def groups(self, letter_set, blanks=0):
+        """Yield the id ranges of the anagram groups using only letters of the letter set - up to blanks others."""
+        m_mask = self.mask(letter_set)
+        bounds = self._bounds
+        for g, g_mask in enumerate(self._group_masks):
+            if not g_mask & ~m_mask or covers(g_mask, m_mask, blanks):
+                yield bounds[g], bounds[g + 1]
+
+    def prefiltered(self, letter_set, blanks=0):
+        """Stream every word once that uses only letters present in the letter set - up to blanks others."""
+        word = self.word
+        for start, stop in self.groups(letter_set, blanks):
+            for n in range(start, stop):
+                yield word(n)
+
+    def matching(self, material, places=None):
+        """Yield the words that fit into the material checking the counts once per anagram group."""
+        if places and self._posting_bounds is not None:
+            yield from self.matching_places(material, places)
+            return
+        l_c, blanks = material_counts(material)
+        word = self.word
+        for start, stop in self.groups(l_c, blanks):
+            first = word(start)
+            if not fits(first, l_c, blanks):
+                continue
+            for n in range(start, stop):
+                candidate = first if n == start else word(n)
+                if not places or all(candidate[c] == m for c, m in places.items()):
+                    yield candidate
+
+    def posting(self, position, letter):
+        """Return the sorted ids of the words carrying the letter at the position."""
+        if letter not in self.letter_index:
+            return self._posting_ids[0:0]
+        slot = position * len(self.alphabet) + self.letter_index[letter]
+        return self._posting_ids[self._posting_bounds[slot] : self._posting_bounds[slot + 1]]
+
+    def trigram(self, gram):
+        """Return the sorted ids of the words containing the three letters in a row."""
+        key = trigram_key(gram, self.letter_index)
+        keys = self._trigram_keys
+        k = bisect_left(keys, key) if key is not None else len(keys)
+        if k == len(keys) or keys[k] != key:
+            return self._trigram_ids[0:0]
+        return self._trigram_ids[self._trigram_bounds[k] : self._trigram_bounds[k + 1]]
+
+    def pattern_ids(self, places, grams):
+        """Return the sorted ids of the words with the letters at the places and all trigrams.
+
+        Letters outside the alphabet are left to the caller and None is returned if nothing indexed
+        constrains the words - older databases may lack the postings or trigrams.
+        """
+        postings = []
+        if self._posting_bounds is not None:
+            postings.extend(self.posting(c, m) for c, m in places.items() if m in self.letter_index)
+        if self._trigram_keys is not None:
+            postings.extend(self.trigram(gram) for gram in grams if trigram_key(gram, self.letter_index) is not None)
+        return intersect(postings) if postings else None
+
+    def matching_places(self, material, places):
+        """Yield the words fitting the material among the intersection of the postings of the places."""
+        l_c, blanks = material_counts(material)
+        m_mask = self.mask(l_c)
+        survivors = intersect([self.posting(c, m) for c, m in places.items()])
+        masks, word = self._masks, self.word
+        for n in survivors:
+            if covers(masks[n], m_mask, blanks):
+                candidate = word(n)
+                if fits(candidate, l_c, blanks):
+                    yield candidate
+
+    def matching_dawg(self, material, places=None):
+        """Yield the words fitting the material walking the word graph depth first in word order.
+
+        Every edge consumes one letter of the material - or a blank if the letter is used up - so branches
+        without an available letter are pruned at once. Falls back to matching for databases without the
+        word graph.
+        """
+        if self._dawg_bounds is None:
+            yield from self.matching(material, places)
+            return
+        if not self.count:
+            return
+        l_c, blanks = material_counts(material)
+        letter_index = self.letter_index
+        wanted = [places.get(c) for c in range(self.header["word_length"])] if places else None
+        bounds, targets, chars = self._dawg_bounds, self._dawg_targets, self.dawg_chars
+        last = self.header["word_length"] - 1
+        path = []
+
+        def walk(node, depth, blanks):
+            must = wanted[depth] if wanted else None
+            for e in range(bounds[node], bounds[node + 1]):
+                ch = chars[e]
+                if must is not None and ch != must:
+                    continue
+                if l_c.get(ch):
+                    spent = 0
+                elif blanks and ch in letter_index:
+                    spent = 1
+                else:
+                    continue
+                if depth == last:
+                    yield "".join(path) + ch
+                    continue
+                if not spent:
+                    l_c[ch] -= 1
+                path.append(ch)
+                yield from walk(targets[e], depth + 1, blanks - spent)
+                path.pop()
+                if not spent:
+                    l_c[ch] += 1
+
+        yield from walk(len(bounds) - 2, 0, blanks)
+
+    @cached_property
+    def dawg_chars(self):
+        """Return the edge labels of the word graph decoded once as string - NUL for characters beyond its alphabet."""
+        alphabet = self.header["dawg_alphabet"]
+        return "".join(alphabet[k] if k < len(alphabet) else "\0" for k in self._dawg_letters)
+
+    def matching_vectorized(self, material, places=None):
+        """Yield the same words as matching from one broadcast comparison over the letter count matrix.
+
+        Falls back to matching if NumPy is not installed or the database lacks the count matrix.
+        """
+        numpy = numpy_module()  # pylint: disable=redefined-outer-name
+        if numpy is None or self._counts is None or not self.count:
+            yield from self.matching(material, places)
+            return
+        letter_index = self.letter_index
+        l_c, blanks = material_counts(material)
+        m_counts = numpy.zeros(len(self.alphabet), dtype=numpy.uint8)
+        for ch, n in l_c.items():
+            if ch in letter_index:
+                m_counts[letter_index[ch]] = n
+        masks = numpy.frombuffer(self._masks, dtype=numpy.uint64)
+        counts = numpy.frombuffer(self._counts, dtype=numpy.uint8).reshape(self.count, -1)
+        if blanks:
+            ok = (masks & numpy.uint64(OTHER_BIT & ~self.mask(l_c))) == 0
+            ok &= (counts.astype(numpy.int16) - m_counts).clip(min=0).sum(axis=1) <= blanks
+        else:
+            ok = (masks & numpy.uint64(~self.mask(l_c) & ((1 << 64) - 1))) == 0
+            ok &= (counts <= m_counts).all(axis=1)
+        if places:
+            letters = numpy.frombuffer(self._letters, dtype=numpy.uint8).reshape(self.count, -1)
+            for c, m in places.items():
+                if m not in letter_index:
+                    return
+                ok &= letters[:, c] == letter_index[m]
+        for n in numpy.flatnonzero(ok):
+            yield self.word(int(n))
+
+    def matching_many(self, queries):
+        """Answer many (material, places) queries in one pass over the anagram groups."""
+        prepared = []
+        for material, places in queries:
+            l_c, blanks = material_counts(material)
+            prepared.append((self.mask(l_c), blanks, l_c, places, []))
+        word, bounds = self.word, self._bounds
+        for g, g_mask in enumerate(self._group_masks):
+            interested = [query for query in prepared if not g_mask & ~query[0] or covers(g_mask, query[0], query[1])]
+            if not interested:
+                continue
+            words = [word(n) for n in range(bounds[g], bounds[g + 1])]
+            for _, blanks, l_c, places, found in interested:
+                if fits(words[0], l_c, blanks):
+                    found.extend(w for w in words if not places or all(w[c] == m for c, m in places.items()))
+        return [found for *_, found in prepared]
+
+
+class DatabaseCache:
+    """Keep recently used databases open within a budget of mapped bytes evicting the least recently used."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # path -> (stamp, database)
+
+    @property
+    def size(self):
+        """Return the mapped bytes of all cached databases."""
+        return sum(database.size for _, database in self._entries.values())
+
+    def get(self, path):
+        """Return the open database for path reopening it if the file was replaced."""
+        key = os.fspath(path)
+        stat = os.stat(key)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        database = Database(key)
+        self._entries[key] = (stamp, database)
+        self._entries.move_to_end(key)
+        self.evict()
+        return database
+
+    def evict(self):
+        """Drop least recently used databases until the budget holds - the latest entry always stays."""
+        size = self.size
+        while size > self.budget and len(self._entries) > 1:
+            _, (_, database) = self._entries.popitem(last=False)
+            size -= database.size
+            self.evictions += 1
+
+    def preload(self, paths):
+        """Open the databases at the paths that exist ahead of the first query."""
+        for path in paths:
+            if os.path.exists(path):
+                self.get(path)
+
+    def invalidate(self, paths=None):
+        """Forget the databases at the paths or all databases if no paths are given."""
+        if paths is None:
+            self._entries.clear()
+            return
+        for path in paths:
+            self._entries.pop(os.fspath(path), None)
+
+    def invalidate_prefix(self, prefix):
+        """Forget the databases whose paths start with the prefix."""
+        for key in [key for key in self._entries if key.startswith(os.fspath(prefix))]:
+            del self._entries[key]
+
+    def stats(self):
+        """Return the counters and the occupancy of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size": self.size,
+            "budget": self.budget,
+        }
@@ -1,68 +1,688 @@
 # encoding: utf-8
 # pylint: disable=invalid-name,line-too-long
 """Find words withing letters given."""
-import pickle
-import string
+import hashlib
+import heapq
+import json
+import os
 import sys
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import islice
+from typing import Callable, Optional
 
-ENCODING = "utf-8"
-ASCII_LETTERS = string.ascii_lowercase
-EXTRA_LETTERS = ("ä", "ö", "ü", "ß")
+from words_of_letters import instrument, store
+from words_of_letters.rules import (  # noqa: F401 # pylint: disable=unused-import
+    ALPHABET,
+    ASCII_LETTERS,
+    BLANK,
+    EXTRA_LETTERS,
+    MAX_LETTERS,
+    MAX_SLOTS,
+    OPTIONS,
+    PICTURE_LETTERS,
+    RANKINGS,
+    SWIPE_LETTERS,
+    VALUE_OPTIONS,
+    apply_option_rules,
+    apply_rules,
+    apply_stanza_rules,
+    parse,
+    resolve_workers,
+    split_options,
+    validate,
+)
 
-PICTURE_LETTERS = 12
-SWIPE_LETTERS = 36
-MAX_LETTERS = SWIPE_LETTERS
-MAX_SLOTS = 8
+ENCODING = "utf-8"
 
 LANGUAGE_GRAMMAR = "ngerman"  # Sample for German, new grammar
-LANGUAGE_TEXT_FILE_PATH = f"data/text/{LANGUAGE_GRAMMAR}.dict" 
+LANGUAGE_TEXT_FILE_PATH = f"data/text/{LANGUAGE_GRAMMAR}.dict"
+LANGUAGE_FREQUENCY_FILE_PATH = f"data/text/{LANGUAGE_GRAMMAR}.freq"  # Optional lines of word and count
 DB_BASE_PATH = f"data/db/{LANGUAGE_GRAMMAR}_dict_"
+CACHE_BUDGET_BYTES = int(os.getenv("WOL_CACHE_BYTES", str(256 << 20)))
+RESULT_CACHE_BYTES = int(os.getenv("WOL_RESULT_CACHE_BYTES", str(64 << 20)))  # Zero disables the persistent results
+SOLVER_VERSION = 1  # Bump whenever the words a query returns change so persistent results of older code miss
+ENGINE = os.getenv("WOL_ENGINE", "auto")  # auto, numpy (vectorize when NumPy is installed), dawg or python
+VECTORIZE_MIN_WORDS = 1_000_000  # Auto imports NumPy only for buckets where vectorizing outweighs its import
+
+LETTER_BITS = store.letter_bits_of(ALPHABET)
+OTHER_BIT = store.OTHER_BIT
+signature = store.signature
+
+CACHE = store.DatabaseCache(CACHE_BUDGET_BYTES)
+PACKED = {}  # path -> (stamp, open block compressed database)
+
+
+@dataclass(frozen=True)
+class Language:
+    """A dictionary with its alphabet, word normalization, text sources and databases."""
+
+    name: str
+    alphabet: str
+    text_path: str
+    db_base_path: str
+    frequency_path: Optional[str] = None
+    normalize: Callable[[str], str] = str.lower
+
+    def __post_init__(self):
+        if len(self.alphabet) > store.MAX_ALPHABET:
+            raise ValueError(
+                f"ERROR Alphabet of language ({self.name}) has ({len(self.alphabet)}) letters - at most ({store.MAX_ALPHABET}) fit the letter masks"
+            )
+
+    @cached_property
+    def letter_bits(self):
+        return store.letter_bits_of(self.alphabet)
+
+
+LANGUAGES = {}
+
+
+def register_language(language):
+    """Register the language by name for lazy use by any query."""
+    LANGUAGES[language.name] = language
+    return language
+
+
+def default_language():
+    """Return the language the module globals configure."""
+    return Language(LANGUAGE_GRAMMAR, ALPHABET, LANGUAGE_TEXT_FILE_PATH, DB_BASE_PATH, LANGUAGE_FREQUENCY_FILE_PATH)
+
+
+def get_language(name=None):
+    """Return the registered language of the name - the default language if no name is given."""
+    if name is None or name == LANGUAGE_GRAMMAR and name not in LANGUAGES:
+        return default_language()
+    try:
+        return LANGUAGES[name]
+    except KeyError:
+        known = ", ".join(sorted({LANGUAGE_GRAMMAR, *LANGUAGES}))
+        raise ValueError(f"ERROR Unknown language ({name}) - use one of ({known})") from None
+
+
+def evict_language(language):
+    """Drop all databases of the language from the warm cache - they load again on the next query."""
+    CACHE.invalidate_prefix(language.db_base_path)
+
+
+register_language(
+    Language("english", ASCII_LETTERS, "data/text/english.dict", "data/db/english_dict_", "data/text/english.freq")
+)
+
 
+def letter_mask(chars, language=None):
+    """Return the letter presence bitmask of the chars."""
+    return store.letter_mask(chars, LETTER_BITS if language is None else language.letter_bits)
 
-def read_mixed_case_word_text(word_length):
+
+def normalized_words(handle, normalize=str.lower):
+    """Stream the stripped and normalized (lower cased) words of a text handle."""
+    for line in handle:
+        word = line.strip()
+        if word:
+            yield normalize(word)
+
+
+def hashed_lines(handle, digest):
+    """Stream the raw lines of a handle updating the digest on the way."""
+    for line in handle:
+        digest.update(line)
+        yield line
+
+
+def read_word_text_buckets(word_lengths, digest=None, language=None):
+    """Read the text once and bucket the words by length for the lengths requested.
+
+    A hashlib object given as digest is updated with the raw bytes in the same pass.
+    """
+    language = language or default_language()
+    wanted = set(word_lengths)
+    buckets = {wl: set() for wl in wanted}
+    with open(language.text_path, "rb") as handle:
+        if digest is not None:
+            handle = hashed_lines(handle, digest)
+        for word in normalized_words((line.decode(ENCODING) for line in handle), language.normalize):
+            wl = len(word)
+            if wl in wanted:
+                buckets[wl].add(word)
+    return buckets
+
+
+def read_mixed_case_word_text(word_length, language=None):
     """Setup the database ..."""
-    with open(LANGUAGE_TEXT_FILE_PATH, "rt", encoding=ENCODING) as handle:
-        wl = word_length
-        ld = handle.readlines
-        return {
-            x.strip().lower() for x in ld() if len(x.strip()) == wl
-        }
+    return read_word_text_buckets((word_length,), language=language)[word_length]
+
+
+def db_path_of(word_length, suffix="wol", language=None):
+    """Return the path of the database for word length."""
+    return f"{(language or default_language()).db_base_path}{word_length}.{suffix}"
+
 
+def read_frequencies(language=None):
+    """Read the optional companion word frequencies - one word and count per line."""
+    language = language or default_language()
+    frequencies = {}
+    if not language.frequency_path:
+        return frequencies
+    try:
+        handle = open(language.frequency_path, "rt", encoding=ENCODING)
+    except FileNotFoundError:
+        return frequencies
+    with handle:
+        for line in handle:
+            fields = line.split()
+            if len(fields) == 2 and fields[1].isdigit():
+                word = language.normalize(fields[0])
+                frequencies[word] = frequencies.get(word, 0) + int(fields[1])
+    return frequencies
 
-def dump(word_set):
+
+def dump(word_set, frequencies=None, language=None, dawg=False):
     """Dump the database ..."""
+    language = language or default_language()
     word_length = len(next(iter(word_set)))  # HACK A DID ACK get some element
-    db_path = f"{DB_BASE_PATH}{word_length}.pickle"
-    with open(db_path, "wb") as handle:
-        pickle.dump(word_set, handle)
+    db_path = db_path_of(word_length, language=language)
+    store.write_database(db_path, word_set, language.alphabet, frequencies, dawg)
+    CACHE.invalidate([db_path])
+
+
+def open_database(word_length, language=None):
+    """Return the memory mapped database for word length from the warm cache."""
+    with instrument.phase("open"):
+        return CACHE.get(db_path_of(word_length, language=language))
+
+
+def preload(word_lengths, language=None):
+    """Warm the cache with the databases for the word lengths."""
+    CACHE.preload(db_path_of(word_length, language=language) for word_length in word_lengths)
+
+
+def invalidate(word_lengths=None, language=None):
+    """Drop the databases for the word lengths or all databases from the warm cache."""
+    if word_lengths is None:
+        CACHE.invalidate()
+        return
+    CACHE.invalidate([db_path_of(word_length, language=language) for word_length in word_lengths])
+
+
+def packed_path(language=None):
+    """Return the path of the block compressed database holding all word lengths."""
+    return f"{(language or default_language()).db_base_path}packed.woz"
+
+
+def open_packed(word_length, language=None):
+    """Return the open block compressed database if it stores the word length - reopened once rewritten."""
+    from words_of_letters.packed import PackedDatabase  # pylint: disable=import-outside-toplevel
 
+    path = packed_path(language)
+    stamp = file_stamp(path)
+    if stamp is None:
+        PACKED.pop(path, None)
+        raise FileNotFoundError(path)
+    if path not in PACKED or PACKED[path][0] != stamp:
+        PACKED[path] = (stamp, PackedDatabase(path))
+    database = PACKED[path][1]
+    if word_length not in database.lengths:
+        raise FileNotFoundError(f"{path} has no words of length {word_length}")
+    return database
+
+
+def prefix_of(places):
+    """Return the letters the places fix at the start of the word."""
+    prefix = ""
+    while places and len(prefix) in places:
+        prefix += places[len(prefix)]
+    return prefix
+
+
+def load_legacy(word_length, language=None):
+    """Load the pickled set of words for word length from before the memory mapped databases."""
+    import pickle  # pylint: disable=import-outside-toplevel
+
+    with open(db_path_of(word_length, "pickle", language), "rb") as handle:
+        return pickle.load(handle, encoding=ENCODING)
+
+
+def prefilter(words, letter_set, language=None, blanks=0):
+    """Stream every word once that uses only letters present in the letter set - up to blanks others."""
+    bits = LETTER_BITS if language is None else language.letter_bits
+    m_mask = store.letter_mask(letter_set, bits)
+    lm, covers = store.letter_mask, store.covers
+    return (word for word in words if covers(lm(word, bits), m_mask, blanks))
+
+
+def load(word_length, letter_set, language=None, blanks=0, prefix=""):
+    """Load database for word length and stream the candidates passing the letter mask prefilter.
+
+    Falls back to the block compressed database (decompressing only blocks that may hold the prefix)
+    and then to legacy pickles.
+    """
+    try:
+        database = open_database(word_length, language)
+    except FileNotFoundError:
+        try:
+            packed = open_packed(word_length, language)
+        except FileNotFoundError:
+            words = load_legacy(word_length, language)
+            instrument.count(f"load:{word_length}:words", len(words))
+            return instrument.counted(f"load:{word_length}:prefiltered", prefilter(words, letter_set, language, blanks))
+        instrument.count(f"load:{word_length}:words", packed.count(word_length))
+        return instrument.counted(f"load:{word_length}:prefiltered", packed.prefiltered(word_length, letter_set, blanks, prefix))
+    instrument.count(f"load:{word_length}:words", len(database))
+    return instrument.counted(f"load:{word_length}:prefiltered", database.prefiltered(letter_set, blanks))
+
+
+def check_words(words, language=None):
+    """Yield (word, valid) per word of the stream looking each up in the database of its normalized length.
+
+    Lengths without database fall back to the block compressed database and then to legacy pickles and
+    are invalid without any.
+    """
+    language = language or default_language()
+    lookups = {}
+    for word in words:
+        normalized = language.normalize(word.strip())
+        n = len(normalized)
+        if n not in lookups:
+            for opener in (open_database, open_packed, load_legacy):
+                try:
+                    lookups[n] = opener(n, language).__contains__
+                    break
+                except FileNotFoundError:
+                    continue
+            else:
+                lookups[n] = lambda _: False
+        yield word, lookups[n](normalized)
+
+
+def is_word(word, language=None):
+    """Tell if the word is in the dictionary."""
+    return next(check_words([word], language))[1]
+
+
+def manifest_path(language=None):
+    """Return the path of the manifest recording what the databases were derived from."""
+    return f"{(language or default_language()).db_base_path}manifest.json"
+
+
+def read_manifest(language=None):
+    """Read the manifest - an empty one if missing or unreadable."""
+    try:
+        with open(manifest_path(language), "rt", encoding=ENCODING) as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_manifest(manifest, language=None):
+    """Write the manifest atomically."""
+    store.atomic_write(manifest_path(language), [json.dumps(manifest, indent=2, sort_keys=True).encode(ENCODING)])
+
+
+def result_cache_path(language=None):
+    """Return the path of the persistent query results next to the databases."""
+    return f"{(language or default_language()).db_base_path}results.sqlite"
+
+
+def database_version(word_lengths, language=None):
+    """Return the content digests the manifest records and the file identities of the databases for the word lengths.
+
+    Falls back to legacy pickles for lengths without database.
+    """
+    entries = read_manifest(language).get("lengths", {})
+    version = []
+    for n in sorted(set(word_lengths)):
+        for path in (db_path_of(n, language=language), packed_path(language), db_path_of(n, "pickle", language)):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            version.append([n, stat.st_ino, stat.st_mtime_ns, stat.st_size, entries.get(str(n), {}).get("digest")])
+            break
+        else:
+            version.append([n, None])
+    return version
+
+
+def file_stamp(path):
+    """Return the modification time and size of the file at path or None if missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def content_digest(word_set, frequencies):
+    """Return the digest of the words of one length and their frequencies."""
+    digest = hashlib.sha256()
+    for word in sorted(word_set):
+        digest.update(f"{word}\t{frequencies.get(word, 0)}\n".encode(ENCODING))
+    return digest.hexdigest()
+
+
+def derive_databases(first, last, force=False, language=None, dawg=None):
+    """Load words of typical word lengths from text in a single pass and dump as databases.
+
+    The manifest records per length the sources it was derived from and a digest so unchanged lengths
+    are not rewritten and nothing is read at all if neither the sources nor the databases changed since.
+    Returns the status per length with the number of words added and removed for rewritten databases.
+    The word graphs only the dawg engine walks are written if asked for - by default if that engine is set.
+    """
+    language = language or default_language()
+    dawg = ENGINE == "dawg" if dawg is None else dawg
+    lengths = range(first, last + 1)
+    manifest = read_manifest(language)
+    entries = manifest.get("lengths", {}) if manifest.get("format") == store.FORMAT else {}
+    sources = {
+        "alphabet": language.alphabet,
+        "text": [language.text_path, file_stamp(language.text_path)],
+        "frequencies": [language.frequency_path, file_stamp(language.frequency_path) if language.frequency_path else None],
+    }
+
+    def stamped(n):
+        entry = entries.get(str(n))
+        if force or entry is None or entry.get("dawg", False) != dawg:
+            return False
+        return entry["stamp"] == file_stamp(db_path_of(n, language=language))
+
+    def current(n):
+        return stamped(n) and entries[str(n)].get("sources") == sources
+
+    if all(current(n) for n in lengths):
+        return {n: {"status": "current"} for n in lengths}
+
+    digest = hashlib.sha256()
+    with instrument.phase("derive:read"):
+        buckets = read_word_text_buckets(lengths, digest, language)
+        frequencies = read_frequencies(language)
+    report = {}
+    for n in lengths:
+        word_set = buckets[n]
+        content = content_digest(word_set, frequencies)
+        if stamped(n) and entries[str(n)]["digest"] == content:
+            entries[str(n)]["sources"] = sources
+            report[n] = {"status": "current"}
+            continue
+        db_path = db_path_of(n, language=language)
+        try:
+            with store.Database(db_path) as database:
+                previous = set(database)
+        except (FileNotFoundError, ValueError):
+            previous = set()
+        if word_set:
+            with instrument.phase("derive:dump"):
+                dump(word_set, frequencies, language, dawg)
+        elif os.path.exists(db_path):
+            os.remove(db_path)
+            CACHE.invalidate([db_path])
+        report[n] = {"status": "written", "added": len(word_set - previous), "removed": len(previous - word_set)}
+        entries[str(n)] = {"digest": content, "count": len(word_set), "stamp": file_stamp(db_path), "sources": sources, "dawg": dawg}
+
+    manifest = {"format": store.FORMAT, "text_sha256": digest.hexdigest(), "lengths": entries}
+    write_manifest(manifest, language)
+    return report
+
+
+def derive_packed(first, last, codec=None, language=None):
+    """Load words of typical word lengths from text in a single pass and write one block compressed database."""
+    from words_of_letters import packed  # pylint: disable=import-outside-toplevel
+
+    codec = codec or packed.DEFAULT_CODEC
+    if codec not in packed.CODECS:
+        raise ValueError(f"ERROR Unknown codec ({codec}) - use one of ({', '.join(sorted(packed.CODECS))})")
+    language = language or default_language()
+    with instrument.phase("derive:read"):
+        buckets = read_word_text_buckets(range(first, last + 1), language=language)
+    with instrument.phase("derive:dump"):
+        packed.write_packed(
+            packed_path(language), {n: word_set for n, word_set in buckets.items() if word_set}, language.alphabet, codec
+        )
+    PACKED.pop(packed_path(language), None)
 
-def load(word_length, letter_set):
-    """Load database for word length."""
-    db_path = f"{DB_BASE_PATH}{word_length}.pickle"
-    params = dict(encoding=ENCODING)
-    l_s = letter_set
-    ld = pickle.load
-    with open(db_path, "rb") as handle:
-        return (word for word in ld(handle, **params) for x in l_s if x in word)
 
+def storage_report(first, last, packed=False, language=None):
+    """Return the number of words, the bytes on disk and the decode throughput in MB/s of the databases.
 
-def derive_databases(first, last):
-    """Load words of typical word lengths from text and dump as pickle databases."""
-    for slots in range(first, last + 1):
-        dump(read_mixed_case_word_text(slots))
+    Times decoding every word of the lengths in [first, last] from cold databases.
+    """
+    from words_of_letters.packed import PackedDatabase  # pylint: disable=import-outside-toplevel
+
+    n_words = size = decoded = 0
+    started = time.perf_counter()
+    if packed:
+        path = packed_path(language)
+        size = os.path.getsize(path)
+        with PackedDatabase(path) as database:
+            streams = [database.words(n) for n in database.lengths if first <= n <= last]
+            for word in (word for stream in streams for word in stream):
+                n_words += 1
+                decoded += len(word.encode(ENCODING))
+    else:
+        for n in range(first, last + 1):
+            path = db_path_of(n, language=language)
+            try:
+                database = store.Database(path)
+            except FileNotFoundError:
+                continue
+            with database:
+                size += os.path.getsize(path)
+                for word in database:
+                    n_words += 1
+                    decoded += len(word.encode(ENCODING))
+    seconds = time.perf_counter() - started
+    return {"words": n_words, "bytes": size, "mb_per_second": decoded / seconds / 1e6 if seconds else 0.0}
+
+
+def migrate_databases(first, last, language=None):
+    """Rewrite the pickled databases found in the range as memory mapped databases."""
+    migrated = []
+    for word_length in range(first, last + 1):
+        try:
+            word_set = load_legacy(word_length, language)
+        except FileNotFoundError:
+            continue
+        if word_set:
+            dump(word_set, language=language)
+            migrated.append(word_length)
+    return migrated
 
 
 def match_gen(candidates, material, places=None):
-    """DRY and streaming."""
-    uniq_ch = set(material)
-    l_c = {u_ch: material.count(u_ch) for u_ch in uniq_ch}
-    for word in set(candidates):
-        if all(u_ch in uniq_ch and l_c[u_ch] >= word.count(u_ch) for u_ch in set(word)):
+    """DRY and streaming - expects unique candidates - blanks in the material stand for any letter."""
+    l_c, blanks = store.material_counts(material)
+    for word in candidates:
+        if store.fits(word, l_c, blanks):
             if not places or all(word[c] == m for c, m in places.items()):
                 yield word
 
 
+def vectorizes(database):
+    """Decide if matching the database should vectorize - in auto only if NumPy is imported already or pays off."""
+    if ENGINE == "numpy":
+        return True
+    return ENGINE == "auto" and (store.numpy_loaded() or len(database) >= VECTORIZE_MIN_WORDS)
+
+
+def candidates_matching(word_length, material, places=None, language=None):
+    """Match the material per anagram group of the database falling back to scanning legacy databases."""
+    try:
+        database = open_database(word_length, language)
+    except FileNotFoundError:
+        return instrument.counted(
+            f"match:{word_length}:matched",
+            match_gen(
+                load(word_length, set(material) - {BLANK}, language, material.count(BLANK), prefix_of(places)),
+                material,
+                places,
+            ),
+        )
+    instrument.count(f"match:{word_length}:words", len(database))
+    if ENGINE == "dawg":
+        return instrument.counted(f"match:{word_length}:matched", database.matching_dawg(material, places))
+    if vectorizes(database) and store.numpy_module() is not None:
+        return instrument.counted(f"match:{word_length}:matched", database.matching_vectorized(material, places))
+    return instrument.counted(f"match:{word_length}:matched", database.matching(material, places))
+
+
+def candidates_matching_many(word_length, queries, language=None):
+    """Answer many (material, places) queries of one word length scanning its database once."""
+    try:
+        database = open_database(word_length, language)
+    except FileNotFoundError:
+        return [list(candidates_matching(word_length, material, places, language)) for material, places in queries]
+    return database.matching_many(queries)
+
+
+def rank_key(word_length, rank, language=None):
+    """Return the sort key ordering words of the length best first with ties broken alphabetically."""
+    if rank == "usage":
+        return lambda word: (-len(set(word)), word)
+    try:
+        database = open_database(word_length, language)
+    except FileNotFoundError:
+        return None
+    return lambda word: (-database.frequency(word), word)
+
+
+def rank_words(word_length, words, rank=None, top=None, language=None):
+    """Return the words ranked (alphabetically without rank) - only the best top if given."""
+    key = rank_key(word_length, rank, language) if rank else None
+    if top:
+        return heapq.nsmallest(top, words, key=key)
+    return sorted(words, key=key)
+
+
+def frequent_first(word_length, material, places=None, language=None):
+    """Stream the matches most frequent first or return None if the database has no frequencies."""
+    try:
+        database = open_database(word_length, language)
+    except FileNotFoundError:
+        return None
+    return database.by_frequency(material, places) if database.ranks_frequency else None
+
+
+def candidates_in_stanzas(word_length, stanzas, places=None, language=None):
+    """Return the sorted words that fit into at least one stanza matching every stanza on its own."""
+    found = set()
+    for stanza in stanzas:
+        found.update(candidates_matching(word_length, stanza, places, language))
+    return sorted(found)
+
+
+def candidates_by_pattern(pattern, first, last, material=None, language=None):
+    """Return the sorted words per length in [first, last] matching the compiled pattern.
+
+    The letters at fixed positions and the trigrams of the pattern narrow the candidates by the indices of
+    the databases before the matcher runs. Given material the words also have to fit into it. Lengths
+    only in the block compressed database are narrowed by the letters fixed at the start and lengths
+    without any database are left out.
+    """
+    found = {}
+    for n in pattern.lengths(first, last):
+        try:
+            database = open_database(n, language)
+            ids = database.pattern_ids(pattern.places(n), pattern.grams)
+            words = database if ids is None else (database.word(k) for k in ids)
+        except FileNotFoundError:
+            try:
+                words = open_packed(n, language).words(n, prefix_of(pattern.places(n)))
+            except FileNotFoundError:
+                continue
+        words = (word for word in words if pattern.matches(word))
+        found[n] = sorted(words if material is None else match_gen(words, material))
+    return found
+
+
+def places_of(placeholder):
+    """Map the positions of the fixed letters of a slot placeholder to the letters."""
+    return {k: v for k, v in enumerate(placeholder) if v != BLANK} if placeholder else {}
+
+
+def search_tuples(letters, n_slots, candidates, first=None, limit=None):
+    """Backtrack the word tuples fitting the letters from the sorted candidates per slot length.
+
+    Visits the slots in the given (descending) order, memoizes the tails per slot and remaining
+    counts, and enforces a non decreasing candidate order within runs of equal slot lengths so no
+    permutation of a tuple is reported twice. The first slot may be restricted to a range of its
+    candidates which keeps the tuples of consecutive ranges in the overall order. Blanks among the
+    letters are shared by all words of a tuple. Given a limit the search stops once that many tuples
+    are found - memoized tails cut short that way are only reused where they suffice.
+    """
+    blanks = letters.count(BLANK)
+    uniq = sorted(set(letters) - {BLANK} | ({ch for words in candidates.values() for word in words for ch in word} if blanks else set()))
+    pools = {slots: [(word, tuple(word.count(ch) for ch in uniq)) for word in words] for slots, words in candidates.items()}
+    last = len(n_slots) - 1
+    memo = {}
+
+    def search(i, remaining, blanks, ks, need):
+        key = (i, remaining, blanks, ks.start)
+        if key in memo:
+            found, complete = memo[key]
+            if complete or len(found) >= need:
+                return found
+        found = []
+        pool = pools[n_slots[i]]
+        same_next = i < last and n_slots[i + 1] == n_slots[i]
+        for k in ks:
+            if len(found) >= need:
+                break
+            word, counts = pool[k]
+            rest = tuple(r - c for r, c in zip(remaining, counts))
+            left = blanks
+            if min(rest) < 0:
+                left += sum(r for r in rest if r < 0)
+                if left < 0:
+                    continue
+                rest = tuple(max(r, 0) for r in rest)
+            if i == last:
+                found.append((word,))
+            else:
+                tail_ks = range(k if same_next else 0, len(pools[n_slots[i + 1]]))
+                found.extend((word, *tail) for tail in search(i + 1, rest, left, tail_ks, need - len(found)))
+        if i:
+            memo[key] = (found, len(found) < need)  # Fewer than needed means nothing was cut short
+        return found
+
+    ks = range(len(pools[n_slots[0]])) if first is None else first
+    found = search(0, tuple(letters.count(ch) for ch in uniq), blanks, ks, float("inf") if limit is None else limit)
+    return found if limit is None else found[:limit]
+
+
+def solve_tuples(letters, n_slots, placeholders=None, stanzas=None, candidates=None, workers=1, language=None, limit=None):
+    """Return the sorted word tuples - one word per slot - that jointly fit into the letter material.
+
+    If stanzas are given every word has to be drawn from a single stanza. The sorted candidates
+    per slot length may be given if already matched, e.g. when solving a batch of puzzles.
+    More than one worker shards the candidates of the first slot across a process pool. Given a limit
+    only the first that many tuples are searched for.
+    """
+    ph_get = (placeholders or {}).get
+    if candidates is None:
+        candidates = {}
+        for slots in set(n_slots):
+            places = places_of(ph_get(slots))
+            if stanzas:
+                candidates[slots] = candidates_in_stanzas(slots, stanzas, places, language)
+            else:
+                candidates[slots] = sorted(candidates_matching(slots, letters, places, language))
+    if any(not candidates[slots] for slots in n_slots):
+        return []
+    n_first = len(candidates[n_slots[0]])
+    if workers <= 1 or len(n_slots) < 2 or n_first < 2:
+        with instrument.phase("combine"):
+            return search_tuples(letters, n_slots, candidates, limit=limit)
+
+    from words_of_letters import parallel  # pylint: disable=import-outside-toplevel
+
+    with instrument.phase("combine"), parallel.executor(workers) as pool:
+        ranges = list(parallel.shards(n_first, workers))
+        parts = pool.map(search_tuples, *zip(*((letters, n_slots, candidates, ks, limit) for ks in ranges)))
+        solutions = [solution for part in parts for solution in part]
+        return solutions if limit is None else solutions[:limit]
+
+
 def display_letters_header(n_letters):
     print(f"{n_letters} Letters available:")
     print()
@@ -81,12 +701,41 @@ def display_stanzas(stanzas):
     print()
 
 
+def blanks_note(words, letters):
+    """Return the note which letters the blanks stand for in the words - empty if none."""
+    if BLANK not in letters:
+        return ""
+    stand_for = store.blanks_of(words, letters)
+    return f" ({BLANK}={','.join(stand_for)})" if stand_for else ""
+
+
 def display_solutions(letters, matches, slots):
     print(
         f"Found {len(matches)} candidates of length({slots}) from "
         f"letters({' '.join(letters)}):"
     )
     col_n = 1 if len(matches) < 26 else 5
+    for n, match in enumerate(matches):
+        if not n % col_n:
+            print()
+        print(f"  {n:3d}) {match}{blanks_note([match], letters)}", end="")
+    print("\n\n")
+
+
+def display_tuples(letters, solutions, n_slots):
+    print(
+        f"Found {len(solutions)} combinations of lengths({', '.join(str(n) for n in n_slots)}) from "
+        f"letters({' '.join(letters)}):"
+    )
+    print()
+    for n, solution in enumerate(solutions):
+        print(f"  {n:3d}) {' '.join(solution)}{blanks_note(solution, letters)}")
+    print("\n")
+
+
+def display_pattern_matches(pattern, matches, slots):
+    print(f"Found {len(matches)} candidates of length({slots}) matching pattern({pattern}):")
+    col_n = 1 if len(matches) < 26 else 5
     for n, match in enumerate(matches):
         if not n % col_n:
             print()
@@ -94,110 +743,353 @@ def display_solutions(letters, matches, slots):
     print("\n\n")
 
 
-def parse(argv):
-    letters = []
-    stanzas = []
-    n_slots = []
-    placeholders = {}
-    warnings, errors = [], []
+def prepare(argv, language=None):
+    """Split options from the argument vector and parse and validate the puzzle.
 
-    if len(argv) < 2:
-        errors.append(
-            "Usage: script <letters> ... <slots> [<placeholders> <slots> ...]\n"
-            f"Received ({argv}) argument vector"
-        )
-        return letters, stanzas, n_slots, placeholders, warnings, errors
-
-    for group in argv:
-        if len(group) > 1:
-            if all(l_char in ASCII_LETTERS or l_char in EXTRA_LETTERS for l_char in group.lower()):
-                stanzas.append([char.lower() for char in group])
-
-    slot_active = False
-    for chars in argv:
-        if all(c not in string.digits for c in chars):
-            for char in chars:
-                l_char = char.lower()
-                if l_char in ASCII_LETTERS or l_char in EXTRA_LETTERS or l_char == "_":
-                    if not slot_active:
-                        if l_char != "_":
-                            letters.append(l_char)
-                        else:
-                            warnings.append(f"WARNING Ignoring placeholder as letter ({char}) ...")
-                    else:
-                        cs = n_slots[-1]
-                        placeholders.setdefault(cs, []).append(l_char)
-                        ph_cs = placeholders[cs]
-                        if len(ph_cs) > cs:
-                            errors.append(f"ERROR {len(ph_cs) - cs} too many placeholders ({ph_cs}) for slot {cs}")
-                            return letters, stanzas, n_slots, placeholders, warnings, errors
-        elif all(c in string.digits for c in chars) and 0 < int(chars) < SWIPE_LETTERS:
-            n_slots.append(int(chars))
-            slot_active = True
+    The language option is resolved to the registered language defaulting to the language given.
+    """
+    options, argv = split_options(argv)
+    try:
+        options["language"] = get_language(options["language"]) if "language" in options else language or default_language()
+    except ValueError as err:
+        return options, False, [], [], [], {}, [], [str(err)]
+    return options, *validate(options, argv, options["language"].alphabet)
+
+
+@dataclass
+class SlotMatches:
+    """The words matching one slot."""
+
+    slots: int
+    words: list
+
+
+@dataclass
+class QueryResult:
+    """The outcome of a query - the matches per slot or the word tuples if combined."""
+
+    letters: list
+    stanzas: list = field(default_factory=list)
+    n_slots: list = field(default_factory=list)
+    warnings: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    matches: list = field(default_factory=list)
+    solutions: Optional[list] = None
+    timings: dict = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def to_dict(self, timings=False):
+        """Return a JSON ready dict - timings are left out unless asked for to keep output reproducible."""
+        data = {"letters": self.letters, "warnings": self.warnings, "errors": self.errors}
+        if self.errors:
+            return data
+        data["slots"] = self.n_slots
+        blanks = BLANK in self.letters
+        if self.solutions is not None:
+            data["solutions"] = self.solutions
+            if blanks:
+                data["blanks"] = [store.blanks_of(solution, self.letters) for solution in self.solutions]
         else:
-            warnings.append(f"WARNING Ignoring characters/slot ({chars}) ...")
+            data["matches"] = [{"slots": match.slots, "words": match.words} for match in self.matches]
+            if blanks:
+                for entry in data["matches"]:
+                    entry["blanks"] = {word: store.blanks_of([word], self.letters) for word in entry["words"]}
+        if timings:
+            data["timings"] = self.timings
+        return data
+
 
-    return letters, stanzas, n_slots, placeholders, warnings, errors
+class Solver:
+    """Library entry point answering puzzles with structured results instead of printing."""
 
+    def __init__(self, workers=1, language=None, results=None):
+        self.workers = workers
+        self.language = language
+        self.results = results  # Optional persistent ResultCache shared across processes
+
+    def iter_matches(self, slots, letters, places=None, stanzas=None, language=None):
+        """Stream the words of one slot unsorted (in database order) and each once."""
+        language = language or self.language
+        if not stanzas:
+            yield from candidates_matching(slots, letters, places, language)
+            return
+        seen = set()
+        for stanza in stanzas:
+            for word in candidates_matching(slots, stanza, places, language):
+                if word not in seen:
+                    seen.add(word)
+                    yield word
+
+    def count(self, slots, letters, places=None, stanzas=None):
+        """Count the words of one slot without sorting or keeping them."""
+        return sum(1 for _ in self.iter_matches(slots, letters, places, stanzas))
+
+    def query(
+        self,
+        letters,
+        n_slots,
+        placeholders=None,
+        stanzas=None,
+        combine=False,
+        limit=None,
+        rank=None,
+        top=None,
+        language=None,
+        workers=None,
+    ):
+        """Answer a validated puzzle - with a limit only the first words found per slot are kept (unsorted).
+
+        A rank (frequency or usage) orders the words best first and top keeps only the best words.
+        Top words by frequency stop scanning once found if the database carries frequencies.
+        Language and workers default to those of the solver.
+        """
+        language = language or self.language
+        ph_get = (placeholders or {}).get
+        result = QueryResult(letters=letters, stanzas=stanzas or [], n_slots=n_slots)
+        timings = result.timings
+        if combine:
+            start = time.perf_counter()
+            workers = self.workers if workers is None else workers
+            result.solutions = solve_tuples(letters, n_slots, placeholders, stanzas, workers=workers, language=language, limit=limit)
+            timings["combine"] = time.perf_counter() - start
+            return result
+        for slots in n_slots:
+            with instrument.phase(f"match:{slots}"):
+                start = time.perf_counter()
+                places = places_of(ph_get(slots))
+                early = None
+                if rank == "frequency" and top and not stanzas:
+                    early = frequent_first(slots, letters, places, language)
+                if early is not None:
+                    words = list(islice(early, top))
+                else:
+                    stream = self.iter_matches(slots, letters, places, stanzas, language)
+                    if rank or top:
+                        words = rank_words(slots, stream, rank, top, language)
+                    else:
+                        words = sorted(stream) if limit is None else list(islice(stream, limit))
+                result.matches.append(SlotMatches(slots, words))
+                timings[f"match:{slots}"] = timings.get(f"match:{slots}", 0.0) + time.perf_counter() - start
+        return result
 
-def apply_rules(letters, stanzas, n_slots, placeholders, warnings, errors):
-    relay_dimensions = letters, stanzas, n_slots, placeholders, warnings
-    if errors:
-        return *relay_dimensions, errors
-    n_letters = len(letters)
-    if n_letters > SWIPE_LETTERS:
-        errors.append(f"ERROR More than {SWIPE_LETTERS} letters given ({n_letters})")
-        return *relay_dimensions, errors
+    def pattern(self, pattern, first, last, letters=None, language=None):
+        """Answer a pattern query over the word lengths in [first, last] - only words fitting the letters if given."""
+        from words_of_letters.pattern import compile_pattern  # pylint: disable=import-outside-toplevel
 
-    if len(n_slots) > MAX_SLOTS:
-        errors.append(f"ERROR More than {MAX_SLOTS} slots given ({len(n_slots)})")
-        return *relay_dimensions, errors
+        result = QueryResult(letters=list(letters or []))
+        try:
+            compiled = compile_pattern(pattern)
+        except ValueError as err:
+            result.errors.append(str(err))
+            return result
+        start = time.perf_counter()
+        with instrument.phase("pattern"):
+            found = candidates_by_pattern(compiled, first, last, letters or None, language or self.language)
+        result.n_slots = sorted(found)
+        result.matches = [SlotMatches(slots, words) for slots, words in sorted(found.items())]
+        result.timings["pattern"] = time.perf_counter() - start
+        return result
 
-    sum_slots = sum(n_slots)
-    if sum_slots > n_letters:
-        errors.append(
-            f"ERROR Only ({n_letters}) characters given but requested ({sum_slots}) slots ({', '.join(str(n) for n in n_slots)}) ..."
+    def pattern_argv(self, options, argv):
+        """Answer a pattern query given the split options and the arguments - first [last] length and letters."""
+        lengths = [int(arg) for arg in argv if arg.isdigit()]
+        try:
+            language = get_language(options.get("language"))
+        except ValueError as err:
+            return QueryResult([], errors=[str(err)])
+        letters = [ch.lower() for arg in argv if not arg.isdigit() for ch in arg if ch.lower() in language.alphabet or ch == BLANK]
+        if not 1 <= len(lengths) <= 2 or lengths[0] > lengths[-1]:
+            return QueryResult(letters, errors=[f"ERROR Pattern needs word lengths <first> [<last>] - received ({' '.join(argv)})"])
+        return self.pattern(options["pattern"], lengths[0], lengths[-1], letters, language)
+
+    def query_argv(self, argv, limit=None):
+        """Parse, validate and answer a puzzle given as argument vector like on the command line."""
+        start = time.perf_counter()
+        with instrument.phase("parse"):
+            options, from_stanzas, letters, stanzas, n_slots, placeholders, warnings, errors = prepare(argv, self.language)
+        parsed = time.perf_counter() - start
+        if errors:
+            return QueryResult(letters, stanzas, n_slots, warnings, errors[:1], timings={"parse": parsed})
+        key = None
+        if self.results is not None:
+            key = self.result_key(options, from_stanzas, letters, stanzas, n_slots, placeholders, limit)
+            with instrument.phase("results"):
+                stored = self.results.get(key)
+            if stored is not None:
+                instrument.count("results:hit")
+                result = QueryResult(letters, stanzas, n_slots, warnings, timings={"parse": parsed})
+                if "solutions" in stored:
+                    result.solutions = [tuple(solution) for solution in stored["solutions"]]
+                else:
+                    result.matches = [SlotMatches(slots, words) for slots, words in stored["matches"]]
+                return result
+            instrument.count("results:miss")
+        result = self.query(
+            letters,
+            n_slots,
+            placeholders,
+            stanzas if from_stanzas else None,
+            "combine" in options,
+            limit,
+            options.get("rank"),
+            options.get("top"),
+            options["language"],
+            resolve_workers(options["workers"]) if "workers" in options else None,
         )
-        return *relay_dimensions, errors
+        result.stanzas, result.warnings = stanzas, warnings
+        result.timings["parse"] = parsed
+        if key is not None:
+            if result.solutions is not None:
+                self.results.put(key, {"solutions": result.solutions})
+            else:
+                self.results.put(key, {"matches": [[match.slots, match.words] for match in result.matches]})
+        return result
+
+    @staticmethod
+    def result_key(options, from_stanzas, letters, stanzas, n_slots, placeholders, limit=None):
+        """Return the key of the canonical query - independent of the order letters and slots are given in."""
+        from words_of_letters.results import digest_of  # pylint: disable=import-outside-toplevel
 
-    if not sum_slots:
-        errors.append(
-            f"ERROR ({n_letters}) character{'' if n_letters == 1 else 's'} given but requested no ({sum_slots}) slots ({', '.join(str(n) for n in n_slots)}) ..."
+        language = options["language"]
+        return digest_of(
+            {
+                "language": [language.name, language.alphabet],
+                "letters": sorted(letters),
+                "stanzas": sorted("".join(stanza) for stanza in stanzas) if from_stanzas else None,
+                "slots": sorted(n_slots),
+                "placeholders": sorted(["".join(chars), slots] for slots, chars in placeholders.items()),
+                "combine": "combine" in options,
+                "rank": options.get("rank"),
+                "top": options.get("top"),
+                "limit": limit,
+                "version": database_version(n_slots, language),
+                "software": [SOLVER_VERSION, store.FORMAT, ENGINE],
+            }
         )
-        return *relay_dimensions, errors
 
-    n_slots.sort(reverse=True)
-    return letters, stanzas, n_slots, placeholders, warnings, errors
+
+def render(result):
+    """Display the matches or combined solutions of a successful query."""
+    respect_stanzas = any(len(s) > 1 for s in result.stanzas)
+
+    def header():
+        if respect_stanzas:
+            display_stanzas(result.stanzas)
+        else:
+            display_letters(result.letters)
+
+    if result.solutions is not None:
+        header()
+        display_tuples(result.letters, result.solutions, result.n_slots)
+        return
+    for match in result.matches:
+        header()
+        display_solutions(result.letters, match.words, match.slots)
 
 
 def solve(argv=None):
     """Drive the solver."""
     argv = argv if argv else sys.argv[1:]
-    if argv[0] in ("-i", "--init"):
-        min_size, max_size = int(argv[1]), int(argv[2])
+    options, command = split_options(argv)
+    if command and command[0] in ("-i", "--init", "-m", "--migrate"):
+        try:
+            language = get_language(options.get("language"))
+        except ValueError as err:
+            print(err)
+            return 2
+    if command and command[0] in ("-i", "--init"):
+        min_size, max_size = int(command[1]), int(command[2])
+        flags = command[3:]
+        packed = next((flag.partition("=")[2] or True for flag in flags if flag.partition("=")[0] == "--packed"), False)
         print(f"Initializing word databases for sizes in [{min_size}, {max_size}] ...")
-        derive_databases(min_size, max_size)
+        if packed:
+            try:
+                derive_packed(min_size, max_size, None if packed is True else packed, language)
+            except ValueError as err:
+                print(err)
+                return 2
+        else:
+            derive_databases(min_size, max_size, force="--force" in flags, language=language, dawg="--dawg" in flags or None)
+        stats = storage_report(min_size, max_size, bool(packed), language)
+        print(
+            f"Stored ({stats['words']}) words in ({stats['bytes']}) bytes"
+            f" ({stats['bytes'] / max(stats['words'], 1):.1f} bytes per word) - decoding ({stats['mb_per_second']:.1f}) MB/s"
+        )
+        return 0
+    if command and command[0] in ("-m", "--migrate"):
+        min_size, max_size = int(command[1]), int(command[2])
+        print(f"Migrating pickled word databases for sizes in [{min_size}, {max_size}] ...")
+        migrated = migrate_databases(min_size, max_size, language)
+        print(f"Migrated sizes ({', '.join(str(n) for n in migrated)})")
         return 0
 
-    letters, stanzas, n_slots, placeholders, warnings, errors = apply_rules(*parse(argv))
+    if "pattern" in options:
+        return solve_pattern(options, command)
 
-    for warning in warnings:
-        print(warning)
+    results = None
+    if RESULT_CACHE_BYTES > 0:
+        from words_of_letters.results import ResultCache  # pylint: disable=import-outside-toplevel
 
-    if errors:
-        print(errors[0])  # Early exit guarantees only one entry
-        return 2
+        try:
+            results = ResultCache(result_cache_path(get_language(options.get("language"))), RESULT_CACHE_BYTES)
+        except ValueError:
+            pass  # The query reports the unknown language
+    with instrument.capture():
+        result = Solver(results=results).query_argv(argv)
+    if results is not None:
+        results.close()
 
-    respect_stanzas = any(len(s) > 1 for s in stanzas)
-    ph_get = placeholders.get
-    for slots in n_slots:
-        if respect_stanzas:
-            display_stanzas(stanzas)
-        else:
-            display_letters(letters)
+    try:
+        for warning in result.warnings:
+            print(warning)
+
+        if result.errors:
+            print(result.errors[0])  # Early exit guarantees only one entry
+            return 2
+
+        with instrument.phase("render"):
+            render(result)
+        return 0
+    finally:
+        instrument.emit(cache=CACHE.stats())
 
-        places = {k: v for k, v in enumerate(ph_get(slots)) if v != "_"} if ph_get(slots) else {}
-        n_candidates = load(slots, set(letters))
-        matches = sorted(set(match_gen(n_candidates, letters, places)))
-        display_solutions(letters, matches, slots)
-    return 0
+
+def solve_pattern(options, argv):
+    """Drive a pattern query."""
+    with instrument.capture():
+        result = Solver().pattern_argv(options, argv)
+    try:
+        if result.errors:
+            print(result.errors[0])
+            return 2
+        with instrument.phase("render"):
+            if result.letters:
+                display_letters(result.letters)
+            found = [match for match in result.matches if match.words]
+            for match in found:
+                display_pattern_matches(options["pattern"], match.words, match.slots)
+            if not found:
+                print(f"Found 0 candidates matching pattern({options['pattern']})")
+        return 0
+    finally:
+        instrument.emit(cache=CACHE.stats())
+
+
+def check(argv):
+    """Drive word validation - the words given or one word per line of standard input for - or none."""
+    options, words = split_options(argv)
+    try:
+        language = get_language(options.get("language"))
+    except ValueError as err:
+        print(err)
+        return 2
+    if not words or words == ["-"]:
+        words = (line.rstrip("\n") for line in sys.stdin if line.strip())
+    invalid = 0
+    for word, valid in check_words(words, language):
+        invalid += not valid
+        print(f"{word}\t{'valid' if valid else 'invalid'}")
+    return 1 if invalid else 0